@@ -0,0 +1,217 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+import cleaning_engine
+from synthetic_pnt import generate_procedimientos, create_test_database
+
+#-------Suite de benchmarks de la limpieza-------
+# Mide cada función de limpieza (clean_cln_*, clean_nombre, lista negra, catálogos) sobre valores
+# sintéticos y la corrida completa de run_cleaning_process contra una base de datos de prueba
+# (SQLite por defecto, o un Postgres local con --db-url). Los resultados se guardan en JSON y
+# con --compare se contrastan contra una corrida anterior para ver regresiones.
+# Si alguna medición falla el benchmark termina con el error y no escribe (ni deja a medias) el JSON.
+# El log de la limpieza y queries.txt van a un directorio temporal, no a los de la carpeta.
+#
+# Se ejecuta desde scripts/cleaning_scripts (las rutas de rejected_list/ y abreviaciones/ son relativas):
+#   python benchmark_cleaning.py --script F1 --rows 10000 --output benchmark_results.json
+
+
+def cleaner_name(cleaner) -> str:
+    return getattr(cleaner, "func", cleaner).__name__
+
+
+def cleaner_targets(module) -> dict:
+    """Una columna representativa por función de limpieza registrada (más las que no están en el registro)."""
+    targets = {}
+    for col, cleaner in module.column_cleaners.items():
+        targets.setdefault(cleaner_name(cleaner), (col, cleaner))
+    targets.setdefault("clean_cln_25", ("domicilio_extranjero_pais", module.clean_cln_25))
+    targets.setdefault("clean_cln_date", (targets["clean_date_column"][0], module.clean_cln_date))
+    targets.setdefault("clean_cln_11", (targets["clean_rfc_column"][0], module.clean_cln_11))
+    targets.setdefault("clean_whitelist_process", (
+        "tipo_procedimiento",
+        partial(module.clean_whitelist_process, table="tipo_procedimiento", table_column="tipo"),
+    ))
+    return targets
+
+
+def time_column_cleaner(cleaner, values: list, col: str) -> dict:
+    """Las funciones por columna (column_level) se miden con una sola llamada sobre toda la muestra."""
+    series = pd.Series(values, dtype=object)
+    start = time.perf_counter()
+    cleaner(series, list(range(len(values))), col)
+    total = time.perf_counter() - start
+    return {
+        "column": col,
+        "calls": len(values),
+        "errors": 0,
+        "total_s": total,
+        "mean_us": total / len(values) * 1e6 if values else 0.0,
+        "p50_us": None,
+        "p99_us": None,
+        "calls_per_s": len(values) / total if total else None,
+    }
+
+
+def time_cleaner(cleaner, values: list, col: str) -> dict:
+    """Tiempo por llamada (sin la memoria de ColumnMemo) sobre los valores de muestra."""
+    if getattr(cleaner, "column_level", False):
+        return time_column_cleaner(cleaner, values, col)
+
+    times = []
+    errors = 0
+    for id_proc, value in enumerate(values):
+        start = time.perf_counter_ns()
+        try:
+            cleaner(value=value, id=id_proc, col=col)
+        except (TypeError, ValueError):
+            errors += 1
+        times.append(time.perf_counter_ns() - start)
+
+    total = sum(times) / 1e9
+    return {
+        "column": col,
+        "calls": len(times),
+        "errors": errors,
+        "total_s": total,
+        "mean_us": total / len(times) * 1e6 if times else 0.0,
+        "p50_us": statistics.median(times) / 1e3 if times else 0.0,
+        "p99_us": sorted(times)[int(len(times) * 0.99) - 1] / 1e3 if len(times) >= 100 else None,
+        "calls_per_s": len(times) / total if total else None,
+    }
+
+
+def run_pipeline(module, chunk_size: int, workers: int) -> dict:
+    """Corrida completa (lectura por bloques, limpieza y escritura de queries) con la memoria vacía."""
+    module.column_memos.clear()
+    module.query_block.clear()
+    rows = 0
+    preparer = module.new_engine.dialect.identifier_preparer
+    with module.new_engine.connect() as connection:
+        rows = connection.exec_driver_sql(f"SELECT COUNT(*) FROM {preparer.quote(module.table)}").scalar()
+
+    start = time.perf_counter()
+    module.run_cleaning_process(chunk_size=chunk_size, workers=workers)
+    total = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "total_s": total,
+        "rows_per_s": rows / total if total else None,
+    }
+
+
+def compare_results(current: dict, previous: dict, tolerance: float) -> list:
+    """Regresa las mediciones que empeoraron más de tolerance respecto a la corrida anterior."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before or not before.get("total_s") or not result.get("total_s"):
+            continue
+        # se compara el costo por llamada/fila para no depender del tamaño de la muestra
+        now_cost = result["total_s"] / (result.get("calls") or result.get("rows") or 1)
+        before_cost = before["total_s"] / (before.get("calls") or before.get("rows") or 1)
+        ratio = now_cost / before_cost
+        status = "REGRESIÓN" if ratio > 1 + tolerance else "ok"
+        print(f"{name}: {ratio:.2f}x respecto a la corrida anterior [{status}]")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de las funciones de limpieza de la PNT")
+    parser.add_argument("--script", default="F1", choices=["F1", "F2", "FG"])
+    parser.add_argument("--rows", type=int, default=10000, help="filas sintéticas de la tabla (10 mil a 5 millones)")
+    parser.add_argument("--sample", type=int, default=5000, help="valores por función de limpieza")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db-url", default=None, help="base de datos de prueba (SQLite temporal si no se indica)")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--skip-pipeline", action="store_true")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--log-path", default=None, help="log de la limpieza (en el directorio temporal si no se indica)")
+    parser.add_argument("--compare", default=None, help="JSON de una corrida anterior")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    importlib.import_module(f"{args.script}_cleaning_script") # registra la tabla y sus limpiadores en cleaning_engine
+    module = cleaning_engine
+    workdir = tempfile.mkdtemp(prefix="pnt_benchmark_")
+    db_url = args.db_url or f"sqlite:///{os.path.join(workdir, 'pnt_benchmark.db')}"
+
+    module.database_url = db_url
+    module.new_engine = create_engine(db_url)
+    module.write_mode = "queries"
+    module.queries_path = os.path.join(workdir, "queries.txt")
+    module.log_path = args.log_path or os.path.join(workdir, "cleaning_errors.log")
+
+    columns = list(module.column_cleaners) + ["domicilio_extranjero_pais"]
+    print(f"Generando {args.rows} filas sintéticas de {module.table} en {db_url}")
+    create_test_database(module.new_engine, module.table, columns, args.rows, args.seed)
+
+    results = {}
+    try:
+        sample = generate_procedimientos(columns, min(args.sample, args.rows), args.seed + 1000)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            module.warm_caches()
+            for name, (col, cleaner) in sorted(cleaner_targets(module).items()):
+                results[name] = time_cleaner(cleaner, sample[col].tolist(), col)
+
+        for name, result in results.items():
+            print(f"{name:<28} {result['mean_us']:>10.1f} us/llamada  ({result['column']})")
+
+        if not args.skip_pipeline:
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                results["pipeline"] = run_pipeline(module, args.chunk_size, args.workers)
+            print(f"pipeline: {results['pipeline']['rows_per_s']:.0f} filas/s ({results['pipeline']['total_s']:.1f} s)")
+    except Exception as error:
+        print(f"El benchmark falló ({error!r}); no se escribió {args.output}. Log de la limpieza: {module.log_path}",
+              file=sys.stderr)
+        raise
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "script": args.script,
+            "table": module.table,
+            "rows": args.rows,
+            "sample": args.sample,
+            "seed": args.seed,
+            "db_url": db_url.split("@")[-1],
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+    # se escribe a un temporal y se reemplaza, así nunca queda un JSON a medias
+    partial_output = f"{args.output}.tmp"
+    with open(partial_output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    os.replace(partial_output, args.output)
+    print(f"Resultados guardados en {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            previous = json.load(file)
+        if compare_results(report, previous, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import io
+import math
+import typing
+from typing import List
+
+import numpy as np
+import pandas as pd
+from psycopg2 import sql
+
+#-------Escritura masiva de los valores limpios-------
+# En lugar de un UPDATE por fila (queries.txt), las filas limpias se copian con COPY a una
+# tabla temporal de staging con los mismos tipos que la tabla destino y se aplican con un
+# solo UPDATE ... FROM staging por bloque. Los valores viajan por COPY, nunca dentro del SQL.
+
+key_column = "id_procedimiento"
+staging_table = "staging_limpieza"
+staging_identifier = sql.Identifier("pg_temp", staging_table) # siempre en el esquema temporal de la sesión
+
+
+def is_null(value: typing.Any) -> bool:
+    """Los limpiadores usan la cadena "NULL" para indicar un valor nulo."""
+    if value is None or value is pd.NA or (isinstance(value, str) and value == "NULL"):
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return value is pd.NaT
+
+
+def copy_field(value: typing.Any) -> str:
+    """Convierte un valor al formato de texto de COPY (\\N para nulos, escapes de tab/salto de línea)."""
+    if is_null(value):
+        return "\\N"
+    value = str(value)
+    return (value.replace("\\", "\\\\")
+                 .replace("\t", "\\t")
+                 .replace("\n", "\\n")
+                 .replace("\r", "\\r"))
+
+
+def changed_cells(raw: pd.DataFrame, cleaned: pd.DataFrame) -> pd.DataFrame:
+    """
+    True en las celdas de cleaned cuyo valor es distinto del original en raw.
+    Los dos lados pasan por copy_field, así que todos los nulos son el mismo: None, NaN, NaT y la
+    cadena "NULL" (la que dejan los limpiadores y la que escribe el modo "queries"); una columna
+    que era nula y sigue nula no cuenta como cambio. Fuera de eso se compara el texto que llegaría
+    a la base de datos (2022 es igual a "2022").
+    Primero se compara con == sobre la columna completa; solo las celdas distintas se convierten a texto.
+    """
+    changed = {}
+    for col in cleaned.columns:
+        raw_values = raw[col].to_numpy(dtype=object)
+        clean_values = cleaned[col].to_numpy(dtype=object)
+        try:
+            mask = np.asarray(raw_values != clean_values, dtype=bool)
+        except TypeError: # pd.NA no se puede comparar con ==: se revisan todas las celdas
+            mask = np.ones(len(clean_values), dtype=bool)
+        for idx in np.flatnonzero(mask):
+            mask[idx] = copy_field(raw_values[idx]) != copy_field(clean_values[idx])
+        changed[col] = mask
+    return pd.DataFrame(changed, index=cleaned.index)
+
+
+def check_key_index(cursor, table: str, key: str = key_column) -> None:
+    """
+    Verifica que exista un índice cuya primera columna sea key antes de hacer el join;
+    sin él cada UPDATE ... FROM termina recorriendo la tabla completa.
+    """
+    cursor.execute(
+        """
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+        WHERE i.indrelid = %s::regclass AND a.attname = %s
+        LIMIT 1
+        """,
+        (table, key),
+    )
+    if cursor.fetchone() is None:
+        raise RuntimeError(
+            f"La tabla [{table}] no tiene un índice sobre [{key}]; "
+            f"créalo antes de la escritura masiva: CREATE INDEX ON {table} ({key});"
+        )
+
+
+def create_staging_table(cursor, table: str, columns: List[str], key: str = key_column) -> None:
+    """Tabla temporal con la llave y las columnas limpias, con los mismos tipos que la tabla destino."""
+    cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(staging_identifier))
+    cursor.execute(
+        sql.SQL("CREATE TEMP TABLE {staging} AS SELECT {cols} FROM {table} WITH NO DATA").format(
+            staging=staging_identifier,
+            cols=sql.SQL(", ").join(sql.Identifier(col) for col in [key] + columns),
+            table=sql.Identifier(table),
+        )
+    )
+
+
+def copy_chunk(cursor, rows: typing.Iterable, columns: List[str], key: str = key_column) -> None:
+    """Envía un bloque de filas (llave, valores...) a la tabla de staging con COPY."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(copy_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+
+    copy_query = sql.SQL("COPY {staging} ({cols}) FROM STDIN").format(
+        staging=staging_identifier,
+        cols=sql.SQL(", ").join(sql.Identifier(col) for col in [key] + columns),
+    )
+    cursor.copy_expert(copy_query, buffer)
+
+
+def update_from_staging(cursor, table: str, columns: List[str], key: str = key_column) -> int:
+    """Un solo UPDATE ... FROM staging para todo el bloque; regresa las filas actualizadas."""
+    set_clause = sql.SQL(", ").join(
+        sql.SQL("{col} = s.{col}").format(col=sql.Identifier(col)) for col in columns
+    )
+    cursor.execute(
+        sql.SQL("UPDATE {table} AS t SET {set_clause} FROM {staging} AS s WHERE t.{key} = s.{key}").format(
+            table=sql.Identifier(table),
+            set_clause=set_clause,
+            staging=staging_identifier,
+            key=sql.Identifier(key),
+        )
+    )
+    return cursor.rowcount
+
+
+def bulk_update(engine, table: str, cleaned: pd.DataFrame, ids: list,
+                chunk_size: int = 50000, key: str = key_column) -> int:
+    """
+    Aplica el DataFrame limpio sobre table por bloques de chunk_size filas:
+    TRUNCATE staging -> COPY del bloque -> UPDATE ... FROM staging -> COMMIT.
+    ids es la llave (id_procedimiento) de cada fila de cleaned, en el mismo orden.
+    Regresa el total de filas actualizadas.
+    """
+    columns = list(cleaned.columns)
+    if not columns or not len(cleaned):
+        return 0
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        check_key_index(cursor, table, key)
+        create_staging_table(cursor, table, columns, key)
+        connection.commit()
+
+        updated = 0
+        for start in range(0, len(cleaned), chunk_size):
+            chunk = cleaned.iloc[start:start + chunk_size]
+            rows = ((id_proc,) + values for id_proc, values in
+                    zip(ids[start:start + chunk_size], chunk.itertuples(index=False, name=None)))
+
+            cursor.execute(sql.SQL("TRUNCATE {}").format(staging_identifier))
+            copy_chunk(cursor, rows, columns, key)
+            updated += update_from_staging(cursor, table, columns, key)
+            connection.commit()
+
+        cursor.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(staging_identifier))
+        connection.commit()
+        return updated
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
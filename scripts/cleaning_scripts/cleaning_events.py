@@ -0,0 +1,114 @@
+import logging
+import queue
+import sys
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+
+#-------Registro de eventos de limpieza-------
+# Los limpiadores ya no imprimen ni formatean un mensaje por cada coincidencia. Cada evento
+# (coincidencia con la lista negra, valor fuera de rango...) se cuenta por columna y tipo, y solo
+# los primeros sample_size de cada uno se mandan al log en nivel DEBUG con formato diferido (%s).
+# Al final de la corrida se escribe un resumen por columna en lugar de una línea por fila.
+# Los handlers reales (archivo y consola) corren en un hilo aparte (QueueListener): quien registra
+# solo pone el registro en una cola y sigue limpiando.
+
+logger = logging.getLogger("limpieza")
+logger.addHandler(logging.NullHandler()) # sin setup_logging (ej. en el benchmark) no se escribe nada
+log_format = "%(asctime)s - %(levelname)s - %(message)s"
+
+
+def setup_logging(filename: str = "cleaning_errors.log", level: int = logging.WARNING,
+                  console_level: int = logging.INFO) -> QueueListener:
+    """
+    Manda el logger "limpieza" a una cola y arranca el QueueListener que escribe en filename
+    (desde level) y en la consola (desde console_level). Regresa el listener para detenerlo
+    con stop_logging al terminar.
+    """
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(filename, encoding="utf-8")
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(min(level, console_level))
+    logger.propagate = False
+
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: QueueListener) -> None:
+    """Vacía la cola, cierra los handlers y deja el logger sin salida."""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.NullHandler())
+
+
+class CleaningEvents:
+    """
+    Conteo de eventos por (columna, tipo): total, detalle más frecuente (ej. la entrada de la lista
+    negra que coincidió) y unos cuantos valores de ejemplo. Como los limpiadores por valor pasan
+    por la memoria de la columna, cada valor distinto se registra una sola vez por proceso.
+    """
+
+    def __init__(self, sample_size: int = 3):
+        self.sample_size = sample_size
+        self.counts = Counter()
+        self.details = {}
+        self.examples = {}
+
+    def record(self, col: str, kind: str, value=None, detail=None) -> None:
+        key = (col, kind)
+        self.counts[key] += 1
+        if detail is not None:
+            self.details.setdefault(key, Counter())[detail] += 1
+        examples = self.examples.setdefault(key, [])
+        if len(examples) < self.sample_size:
+            examples.append(value)
+            logger.debug("[%s] %s: %r (%s)", col, kind, value, detail)
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.details.clear()
+        self.examples.clear()
+
+    def state(self) -> dict:
+        """Estado serializable para mandarlo de los procesos del pool al proceso principal."""
+        return {"counts": dict(self.counts), "details": self.details, "examples": self.examples}
+
+    def merge(self, state: dict) -> None:
+        self.counts.update(state["counts"])
+        for key, details in state["details"].items():
+            self.details.setdefault(key, Counter()).update(details)
+        for key, examples in state["examples"].items():
+            own = self.examples.setdefault(key, [])
+            own.extend(examples[:self.sample_size - len(own)])
+
+    def summary(self, top: int = 3) -> dict:
+        """columna -> tipo -> {count, top (detalle, veces), examples}."""
+        result = {}
+        for (col, kind), count in sorted(self.counts.items(), key=lambda item: (str(item[0][0]), -item[1])):
+            result.setdefault(col, {})[kind] = {
+                "count": count,
+                "top": self.details.get((col, kind), Counter()).most_common(top),
+                "examples": self.examples.get((col, kind), []),
+            }
+        return result
+
+    def log_summary(self, level: int = logging.WARNING) -> None:
+        if not self.counts:
+            return
+        logger.log(level, "Resumen de eventos de limpieza por columna (valores distintos):")
+        for col, kinds in self.summary().items():
+            for kind, stats in kinds.items():
+                top = ", ".join(f"{detail!r} x{times}" for detail, times in stats["top"])
+                logger.log(level, "%s: %s = %d%s", col, kind, stats["count"], f" [{top}]" if top else "")
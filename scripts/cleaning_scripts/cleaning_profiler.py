@@ -0,0 +1,219 @@
+import json
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+#-------Perfilado de la limpieza-------
+# Mide cada limpiador y cada etapa de la corrida (read, clean, write) y al final escribe un reporte JSON.
+# Solo existe mientras el perfilado está activo (profile_path en los scripts de limpieza); sin él,
+# los limpiadores no se envuelven y el motor solo revisa que el perfilador sea None.
+# Los tiempos se guardan en un histograma logarítmico en lugar de la lista de llamadas, así la
+# memoria no crece con la tabla y los histogramas de varios procesos se pueden sumar.
+
+
+def cleaner_name(cleaner) -> str:
+    """Nombre de la función de limpieza (también para partial y los decorados con wraps)."""
+    return getattr(cleaner, "func", cleaner).__name__
+
+
+class TimingStats:
+    """Llamadas, tiempo total y percentiles aproximados (error < 10%) de una función o etapa."""
+
+    buckets_per_octave = 8
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.histogram = Counter()
+
+    def add(self, elapsed_ns: int) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.histogram[int(math.log2(elapsed_ns + 1) * self.buckets_per_octave)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Límite superior (en ns) de la cubeta donde cae el percentil q (0-100)."""
+        if not self.calls:
+            return 0.0
+        rank = math.ceil(self.calls * q / 100)
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return 2 ** ((bucket + 1) / self.buckets_per_octave)
+        return 0.0
+
+    def state(self) -> dict:
+        return {"calls": self.calls, "total_ns": self.total_ns, "histogram": dict(self.histogram)}
+
+    def merge(self, state: dict) -> None:
+        self.calls += state["calls"]
+        self.total_ns += state["total_ns"]
+        self.histogram.update(state["histogram"])
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "total_s": self.total_ns / 1e9,
+            "mean_us": self.total_ns / self.calls / 1e3 if self.calls else 0.0,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+        }
+
+
+class ColumnProfile:
+    """Tiempos y conteos de una columna: la columna completa por bloque y cada llamada al limpiador."""
+
+    def __init__(self, cleaner: str = None):
+        self.cleaner = cleaner
+        self.per_value = False # True si el limpiador se llama valor por valor (con la memoria)
+        self.column = TimingStats() # una medición por bloque
+        self.calls = TimingStats() # una medición por llamada real al limpiador
+        self.values = 0
+        self.null_in = 0
+        self.nulled = 0 # valores no nulos que el limpiador dejó en NULL
+
+    def state(self) -> dict:
+        return {
+            "cleaner": self.cleaner,
+            "per_value": self.per_value,
+            "column": self.column.state(),
+            "calls": self.calls.state(),
+            "values": self.values,
+            "null_in": self.null_in,
+            "nulled": self.nulled,
+        }
+
+    def merge(self, state: dict) -> None:
+        self.cleaner = self.cleaner or state["cleaner"]
+        self.per_value = self.per_value or state["per_value"]
+        self.column.merge(state["column"])
+        self.calls.merge(state["calls"])
+        self.values += state["values"]
+        self.null_in += state["null_in"]
+        self.nulled += state["nulled"]
+
+
+class CleaningProfiler:
+    """Perfilado de una corrida: etapas read/clean/write y una entrada por columna."""
+
+    def __init__(self):
+        self.stages = {}
+        self.columns = {}
+        self.wrappers = {}
+
+    def column(self, col: str, cleaner=None) -> ColumnProfile:
+        profile = self.columns.get(col)
+        if profile is None:
+            profile = self.columns[col] = ColumnProfile(cleaner_name(cleaner) if cleaner else None)
+        return profile
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.stages.setdefault(name, TimingStats()).add(time.perf_counter_ns() - start)
+
+    @contextmanager
+    def time_column(self, col: str, cleaner):
+        """Mide la limpieza de la columna completa de un bloque."""
+        profile = self.column(col, cleaner)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            profile.column.add(time.perf_counter_ns() - start)
+
+    def iterate(self, name: str, iterable):
+        """Recorre iterable midiendo en la etapa name el tiempo de obtener cada elemento."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def wrap(self, col: str, cleaner):
+        """
+        Envuelve el limpiador por valor de col para medir cada llamada. Regresa siempre el mismo
+        objeto para el mismo limpiador, así la memoria de la columna no se reinicia en cada bloque.
+        """
+        wrapper = self.wrappers.get(col)
+        if wrapper is not None and wrapper.__wrapped__ is cleaner:
+            return wrapper
+
+        profile = self.column(col, cleaner)
+        profile.per_value = True
+        calls = profile.calls
+
+        @wraps(cleaner)
+        def timed_cleaner(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return cleaner(*args, **kwargs)
+            finally:
+                calls.add(time.perf_counter_ns() - start)
+
+        self.wrappers[col] = timed_cleaner
+        return timed_cleaner
+
+    def count_nulls(self, col: str, raw, cleaned) -> None:
+        """Cuenta los valores del bloque, los nulos de origen y los que el limpiador dejó en NULL."""
+        profile = self.column(col)
+        raw_null = raw.isna()
+        cleaned_null = cleaned.isna() | cleaned.map(lambda value: isinstance(value, str) and value == "NULL").astype(bool)
+        profile.values += len(raw)
+        profile.null_in += int(raw_null.sum())
+        profile.nulled += int((cleaned_null & ~raw_null).sum())
+
+    def state(self) -> dict:
+        """Estado serializable para mandarlo de los procesos del pool al proceso principal."""
+        return {
+            "stages": {name: stats.state() for name, stats in self.stages.items()},
+            "columns": {col: profile.state() for col, profile in self.columns.items()},
+        }
+
+    def merge(self, state: dict) -> None:
+        for name, stats in state["stages"].items():
+            self.stages.setdefault(name, TimingStats()).merge(stats)
+        for col, profile in state["columns"].items():
+            self.column(col).merge(profile)
+
+    def report(self, memo_report: dict = None, meta: dict = None) -> dict:
+        memo_report = memo_report or {}
+        columns = {}
+        for col, profile in self.columns.items():
+            non_null = profile.values - profile.null_in
+            column = profile.column.summary()
+            calls = profile.calls.summary() if profile.per_value else column
+            columns[col] = {
+                "cleaner": profile.cleaner,
+                "values": profile.values,
+                "total_s": column["total_s"],
+                "us_per_value": column["total_s"] * 1e6 / profile.values if profile.values else 0.0,
+                "calls": calls["calls"],
+                "p50_us": calls["p50_us"],
+                "p99_us": calls["p99_us"],
+                "cache_hit_rate": memo_report.get(col, {}).get("hit_rate"),
+                "null_in_rate": profile.null_in / profile.values if profile.values else 0.0,
+                "null_out_rate": profile.nulled / non_null if non_null else 0.0,
+            }
+        return {
+            "meta": dict(meta or {}, timestamp=datetime.now().isoformat(timespec="seconds")),
+            "stages": {name: stats.summary() for name, stats in self.stages.items()},
+            # las columnas más caras primero
+            "columns": dict(sorted(columns.items(), key=lambda item: -item[1]["total_s"])),
+        }
+
+    def write(self, path: str, memo_report: dict = None, meta: dict = None) -> dict:
+        report = self.report(memo_report, meta)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+        return report
@@ -0,0 +1,160 @@
+from typing import Iterator, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+
+from streaming_reader import object_text_columns
+
+#-------Estado de la limpieza incremental-------
+# Para no volver a limpiar la tabla completa después de cada carga de la PNT se guardan, por tabla:
+# - limpieza_estado: el hash (md5 del renglón completo, calculado en Postgres) de cada fila tal
+#   como quedó después de limpiarla. Si el hash actual no coincide, la fila se volvió a cargar o se
+#   modificó y hay que limpiarla otra vez; si no tiene hash, es nueva.
+# - limpieza_watermark: el id_procedimiento y la fecha_actualizacion más altos ya limpios.
+# Con full_check=True se comparan los hashes de toda la tabla (un solo recorrido dentro de Postgres,
+# sin traer las filas); con full_check=False solo se revisan las filas arriba del watermark.
+# fecha_actualizacion es texto: ya limpia está en aaaa-mm-dd, pero lo que llega de la PNT suele venir
+# en dd/mm/aaaa, así que se compara como fecha (date_sort_key) y no como texto.
+# El hash es de la fila ya limpia: una edición en el origen que deja exactamente los valores que
+# escribió la limpieza no cambia el hash, y esa fila no se vuelve a limpiar ni a escribir (ya tiene esos valores).
+
+key_column = "id_procedimiento"
+date_column = "fecha_actualizacion"
+state_table = "limpieza_estado"
+watermark_table = "limpieza_watermark"
+
+
+def create_state_tables(engine) -> None:
+    """Crea limpieza_estado y limpieza_watermark si todavía no existen."""
+    with engine.begin() as connection:
+        connection.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {state_table} (
+                tabla text NOT NULL,
+                {key_column} bigint NOT NULL,
+                hash_fila text NOT NULL,
+                limpiado timestamp NOT NULL DEFAULT now(),
+                PRIMARY KEY (tabla, {key_column})
+            )
+        """))
+        connection.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {watermark_table} (
+                tabla text PRIMARY KEY,
+                max_id bigint,
+                max_fecha_actualizacion text,
+                filas_ultima_corrida bigint,
+                actualizado timestamp NOT NULL DEFAULT now()
+            )
+        """))
+
+
+def date_sort_key(expression: str) -> str:
+    """
+    Expresión SQL con la fecha de expression como entero aaaammdd, para fechas aaaa-mm-dd (o aaaa/mm/dd)
+    y dd/mm/aaaa (o dd-mm-aaaa, dd.mm.aaaa), con o sin hora. Otros formatos quedan en NULL.
+    Se arma con substring en lugar de to_date para no fallar con fechas inválidas como 31/02/2023.
+    """
+    value = f"btrim(CAST({expression} AS text))"
+    iso = r"'^\d{4}[-/]\d{1,2}[-/]\d{1,2}'"
+    day_first = r"'^\d{1,2}[-/.]\d{1,2}[-/.]\d{4}'"
+    return (
+        f"(CASE WHEN {value} ~ {iso} THEN "
+        rf"substring({value} from '^(\d{{4}})')::int * 10000 "
+        rf"+ substring({value} from '^\d{{4}}[-/](\d{{1,2}})')::int * 100 "
+        rf"+ substring({value} from '^\d{{4}}[-/]\d{{1,2}}[-/](\d{{1,2}})')::int "
+        f"WHEN {value} ~ {day_first} THEN "
+        rf"substring({value} from '^\d{{1,2}}[-/.]\d{{1,2}}[-/.](\d{{4}})')::int * 10000 "
+        rf"+ substring({value} from '^\d{{1,2}}[-/.](\d{{1,2}})')::int * 100 "
+        rf"+ substring({value} from '^(\d{{1,2}})')::int END)"
+    )
+
+
+def load_watermark(engine, table: str) -> Optional[Tuple[int, Optional[str]]]:
+    """(max_id, max_fecha_actualizacion) de la última corrida incremental de table, o None."""
+    with engine.connect() as connection:
+        row = connection.execute(
+            text(f"SELECT max_id, max_fecha_actualizacion FROM {watermark_table} WHERE tabla = :tabla"),
+            {"tabla": table},
+        ).first()
+    return None if row is None else (row[0], row[1])
+
+
+def pending_filter(engine, table: str, full_check: bool, key: str = key_column) -> Tuple[str, dict]:
+    """
+    Condición WHERE (y sus parámetros) de las filas nuevas o cuyo hash cambió.
+    Sin full_check solo se revisan las filas con id o fecha_actualizacion arriba del watermark
+    (o con una fecha_actualizacion que no se puede leer como fecha).
+    """
+    preparer = engine.dialect.identifier_preparer
+    condition = "(s.hash_fila IS NULL OR s.hash_fila <> md5(CAST(t AS text)))"
+    params = {"tabla": table}
+
+    watermark = None if full_check else load_watermark(engine, table)
+    if watermark is not None and watermark[0] is not None:
+        above = f"t.{preparer.quote(key)} > :max_id"
+        params["max_id"] = watermark[0]
+        if watermark[1] is not None:
+            row_date = date_sort_key(f"t.{preparer.quote(date_column)}")
+            above = f"({above} OR {row_date} > {date_sort_key(':max_fecha')} OR {row_date} IS NULL)"
+            params["max_fecha"] = watermark[1]
+        condition = f"{above} AND {condition}"
+    return condition, params
+
+
+def read_pending_chunks(engine, table: str, chunk_size: int = 50000, key: str = key_column,
+                        id_range: Optional[Tuple[int, int]] = None,
+                        full_check: bool = True) -> Iterator[pd.DataFrame]:
+    """
+    Igual que read_table_chunks, pero solo entrega las filas que no se han limpiado o que
+    cambiaron desde la última limpieza, ordenadas por key.
+    """
+    preparer = engine.dialect.identifier_preparer
+    condition, params = pending_filter(engine, table, full_check, key)
+    query = (
+        f"SELECT t.* FROM {preparer.quote(table)} AS t "
+        f"LEFT JOIN {state_table} AS s ON s.tabla = :tabla AND s.{preparer.quote(key)} = t.{preparer.quote(key)} "
+        f"WHERE {condition}"
+    )
+    if id_range is not None:
+        query += f" AND t.{preparer.quote(key)} BETWEEN :low AND :high"
+        params.update(low=id_range[0], high=id_range[1])
+    query += f" ORDER BY t.{preparer.quote(key)}"
+
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as connection:
+        for chunk in pd.read_sql(text(query), connection, params=params, chunksize=chunk_size):
+            yield object_text_columns(chunk)
+
+
+def record_row_hashes(engine, table: str, ids: list, key: str = key_column) -> None:
+    """Guarda el hash de las filas ids tal como quedaron después de escribir los valores limpios."""
+    if not ids:
+        return
+    preparer = engine.dialect.identifier_preparer
+    with engine.begin() as connection:
+        connection.execute(text(f"""
+            INSERT INTO {state_table} (tabla, {key_column}, hash_fila)
+            SELECT :tabla, t.{preparer.quote(key)}, md5(CAST(t AS text))
+            FROM {preparer.quote(table)} AS t
+            WHERE t.{preparer.quote(key)} = ANY(:ids)
+            ON CONFLICT (tabla, {key_column}) DO UPDATE SET hash_fila = EXCLUDED.hash_fila, limpiado = now()
+        """), {"tabla": table, "ids": [int(id_proc) for id_proc in ids]})
+
+
+def update_watermark(engine, table: str, rows: int, key: str = key_column) -> None:
+    """
+    Mueve el watermark de table al id_procedimiento y fecha_actualizacion más altos ya limpios
+    (la fecha más alta como fecha, guardada en aaaa-mm-dd).
+    """
+    preparer = engine.dialect.identifier_preparer
+    row_date = date_sort_key(f"t.{preparer.quote(date_column)}")
+    with engine.begin() as connection:
+        connection.execute(text(f"""
+            INSERT INTO {watermark_table} (tabla, max_id, max_fecha_actualizacion, filas_ultima_corrida)
+            SELECT :tabla, MAX(t.{preparer.quote(key)}), to_char(MAX({row_date}), 'FM0000"-"00"-"00'), :rows
+            FROM {preparer.quote(table)} AS t
+            JOIN {state_table} AS s ON s.tabla = :tabla AND s.{key_column} = t.{preparer.quote(key)}
+            ON CONFLICT (tabla) DO UPDATE SET
+                max_id = EXCLUDED.max_id,
+                max_fecha_actualizacion = EXCLUDED.max_fecha_actualizacion,
+                filas_ultima_corrida = EXCLUDED.filas_ultima_corrida,
+                actualizado = now()
+        """), {"tabla": table, "rows": rows})
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+#-------Lectura, limpieza y escritura traslapadas-------
+# En la corrida secuencial cada bloque se lee, se limpia y se escribe antes de leer el siguiente:
+# mientras se limpia, la base de datos está ociosa, y mientras se lee o se escribe, el CPU también.
+# Aquí cada etapa corre en su propio hilo (la lectura y la escritura son sobre todo espera de red/disco,
+# que libera el GIL) y se comunican con colas acotadas: si una etapa se atrasa, la anterior se detiene
+# al llenarse su cola (backpressure), así en memoria hay a lo más depth bloques por cola.
+
+class StageStats:
+    """Filas, tiempo ocupado y velocidad de una etapa; la ETA usa las filas esperadas si se conocen."""
+
+    def __init__(self, name: str, expected_rows: Optional[int] = None):
+        self.name = name
+        self.expected_rows = expected_rows
+        self.rows = 0
+        self.chunks = 0
+        self.busy_s = 0.0
+        self.start = time.perf_counter()
+
+    def add(self, rows: int, busy_s: float) -> None:
+        self.rows += rows
+        self.chunks += 1
+        self.busy_s += busy_s
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.start
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        rate = self.rate()
+        if self.expected_rows is None or rate <= 0:
+            return None
+        return max(self.expected_rows - self.rows, 0) / rate
+
+    def describe(self) -> str:
+        text = f"{self.name} {self.rows} filas ({self.rate():.0f} filas/s"
+        eta = self.eta()
+        return text + (f", ETA {eta:.0f} s)" if eta is not None else ")")
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.start
+        return {
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "busy_s": self.busy_s,
+            "rows_per_s": self.rows / self.busy_s if self.busy_s else None, # velocidad de la etapa sola
+            "utilization": self.busy_s / elapsed if elapsed else None, # fracción del tiempo que estuvo ocupada
+        }
+
+
+class PipelineError(Exception):
+    """Error de la etapa de lectura o de escritura (en su hilo), re-lanzado en el hilo que corre el pipeline."""
+
+
+done = object() # fin del flujo en una cola
+
+
+def put(channel: queue.Queue, item, stop: threading.Event) -> bool:
+    """put con espera acotada: regresa False si otra etapa falló mientras la cola estaba llena."""
+    while not stop.is_set():
+        try:
+            channel.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run_pipeline(chunks: Iterable, clean: Callable, write: Callable, depth: int = 2,
+                 expected_rows: Optional[int] = None, progress: Optional[Callable] = print) -> tuple:
+    """
+    Lee chunks en un hilo, limpia cada bloque con clean(bloque) en el hilo actual y lo escribe con
+    write(resultado) en otro hilo. Regresa (filas escritas, {etapa: resumen}).
+    progress recibe una línea con filas/s y ETA por etapa después de escribir cada bloque.
+    """
+    stats = {name: StageStats(name, expected_rows) for name in ("lectura", "limpieza", "escritura")}
+    read_queue = queue.Queue(maxsize=depth)
+    write_queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        try:
+            iterator = iter(chunks)
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                stats["lectura"].add(len(chunk), time.perf_counter() - start)
+                if not put(read_queue, chunk, stop):
+                    return
+        except BaseException as error:
+            errors.append(error)
+            stop.set()
+        finally:
+            put(read_queue, done, stop)
+
+    def writer():
+        while True:
+            item = write_queue.get()
+            if item is done:
+                return
+            if stop.is_set():
+                continue # se vacía la cola para no bloquear a la limpieza
+            rows, result = item
+            start = time.perf_counter()
+            try:
+                write(result)
+            except BaseException as error:
+                errors.append(error)
+                stop.set()
+                continue
+            stats["escritura"].add(rows, time.perf_counter() - start)
+            if progress is not None:
+                progress(" | ".join(stage.describe() for stage in stats.values()))
+
+    threads = [threading.Thread(target=reader, name="lectura", daemon=True),
+               threading.Thread(target=writer, name="escritura", daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while not stop.is_set():
+            try:
+                chunk = read_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue # revisa stop: el lector pudo fallar sin alcanzar a poner el fin
+            if chunk is done:
+                break
+            start = time.perf_counter()
+            result = clean(chunk)
+            stats["limpieza"].add(len(chunk), time.perf_counter() - start)
+            if not put(write_queue, (len(chunk), result), stop):
+                break
+    except BaseException:
+        stop.set()
+        raise # los errores de la limpieza (hilo actual) se propagan tal cual, después de cerrar los hilos
+    finally:
+        write_queue.put(done) # el escritor siempre vacía la cola, así que este put no se queda bloqueado
+        threads[1].join()
+        stop.set() # el lector deja de esperar si la limpieza terminó antes (por un error)
+        threads[0].join()
+
+    if errors:
+        if isinstance(errors[0], Exception):
+            raise PipelineError(f"La corrida en pipeline se detuvo: {errors[0]!r}") from errors[0]
+        raise errors[0]
+    return stats["escritura"].rows, {name: stage.summary() for name, stage in stats.items()}
@@ -0,0 +1,43 @@
+from typing import Iterator, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+
+#-------Lectura por bloques de las tablas procedimientos_*-------
+# pd.read_sql_table cargaba la tabla completa en memoria antes de empezar a limpiar.
+# Aquí se abre un cursor del lado del servidor (stream_results) y se van entregando
+# bloques de chunk_size filas ordenadas por id_procedimiento, así la memoria máxima
+# depende del tamaño del bloque y no del tamaño de la tabla.
+
+key_column = "id_procedimiento"
+
+
+def object_text_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deja las columnas de texto como object con None en los nulos, que es lo que esperan los limpiadores.
+    Desde pandas 3 read_sql (y la conversión de Parquet) regresa el texto como StringDtype con NaN.
+    Todos los lectores de bloques pasan por aquí antes de entregar cada bloque.
+    """
+    for col in chunk.columns:
+        if isinstance(chunk[col].dtype, pd.StringDtype):
+            chunk[col] = chunk[col].astype(object).where(chunk[col].notna(), None)
+    return chunk
+
+
+def read_table_chunks(engine, table: str, chunk_size: int = 50000, key: str = key_column,
+                      id_range: Optional[Tuple[int, int]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Genera DataFrames de hasta chunk_size filas de table, ordenados por key.
+    Con id_range = (inicio, fin) solo se leen las filas con key entre ambos (inclusive).
+    """
+    preparer = engine.dialect.identifier_preparer
+    query = f"SELECT * FROM {preparer.quote(table)}"
+    params = {}
+    if id_range is not None:
+        query += f" WHERE {preparer.quote(key)} BETWEEN :low AND :high"
+        params = {"low": id_range[0], "high": id_range[1]}
+    query += f" ORDER BY {preparer.quote(key)}"
+
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as connection:
+        for chunk in pd.read_sql(text(query), connection, params=params, chunksize=chunk_size):
+            yield object_text_columns(chunk)
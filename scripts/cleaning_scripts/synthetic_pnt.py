@@ -0,0 +1,266 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+#-------Generador de filas sintéticas de procedimientos_*-------
+# Sirve para medir los limpiadores sin depender de la base de datos real. Cada columna se llena
+# según su tipo (fechas, RFC, nombres, montos, catálogos...) imitando la suciedad de los datos
+# de la PNT: RFC con espacios o varios RFC juntos, nombres con acentos y prefijos de profesión,
+# variantes de "No aplica", fechas en distintos formatos, números de serie de Excel, etc.
+
+no_aplica = ["No aplica", "NO APLICA", "no aplica.", "N/A", "NA", "No Aplica ", "-", "S/N", "NO DISPONIBLE", ""]
+
+nombres = ["Juan", "José Luis", "María", "Ma. Guadalupe", "Jesús", "Adrián", "Sofía", "Andrés", "Mónica", "Ángel",
+           "Héctor", "Begoña", "Raúl", "Martín", "Verónica", "Joaquín", "Inés", "Rubén", "Iván", "Nicolás"]
+apellidos = ["Pérez", "Hernández", "García", "Martínez", "López", "González", "Rodríguez", "Sánchez", "Ramírez",
+             "Núñez", "Muñoz", "Ibáñez", "Gutiérrez", "Jiménez", "Vázquez", "Ávila", "Chávez", "Domínguez"]
+profesiones = ["Lic.", "Ing.", "Dr.", "Arq.", "C.P.", "Mtro.", "M.V.Z.", "Q.F.B."]
+sufijos = ["S.A. de C.V.", "S. de R.L. de C.V.", "SA DE CV", "S.C.", "A.C.", "SAB DE CV"]
+giros = ["Comercializadora", "Constructora", "Servicios Integrales", "Distribuidora", "Grupo", "Soluciones",
+         "Consultoría", "Tecnologías", "Abastecedora", "Impresos"]
+marcas = ["del Bajío", "Queretana", "Reyes", "Omega", "Alfa", "Central", "Norte", "Santa Rosa", "Jurica", "Libertad"]
+
+tipos_procedimiento = ["Adjudicación directa", "ADJUDICACION DIRECTA", "Licitación pública", "licitacion publica",
+                       "Invitación a cuando menos tres personas", "Otro (especificar)"]
+tipos_vialidad = ["Calle", "Avenida", "AVENIDA", "Boulevard", "Privada", "Carretera", "Prolongación", "Calzada", "Av.", "C."]
+tipos_asentamiento = ["Colonia", "Fraccionamiento", "Barrio", "Pueblo", "Ciudad", "Parque industrial", "Col.", "Fracc."]
+vialidades = ["Universidad", "5 de Febrero", "Constituyentes", "Zaragoza", "Corregidora", "Pasteur", "Ezequiel Montes",
+              "Bernardo Quintana", "Av. Tecnológico", "Hidalgo", "Madero"]
+asentamientos = ["Centro", "Centro Sur", "Jurica", "Juriquilla", "El Pueblito", "Carretas", "Cimatario", "Álamos"]
+localidades = ["Querétaro", "Santiago de Querétaro", "El Pueblito", "San Juan del Río", "Tequisquiapan", "Jalpan"]
+municipios = ["Querétaro", "Corregidora", "El Marqués", "San Juan del Río", "Huimilpan", "Tequisquiapan", "14", "6"]
+entidades = ["Querétaro", "QUERETARO", "Querétaro de Arteaga", "Ciudad de México", "Jalisco", "Guanajuato", "22"]
+paises = ["México", "MX", "Estados Unidos", "España", "Canadá"]
+areas = ["Dirección de Administración", "Coordinación Administrativa", "Área de Informática", "Secretaría de Finanzas",
+         "Departamento de Recursos Materiales", "Dirección Jurídica", "Unidad de Transparencia"]
+monedas = ["MXN", "Peso mexicano", "pesos", "Nacional", "Moneda nacional", "USD", "Dólares", "DÓLARES AMERICANOS", "EUR"]
+formas_pago = ["Transferencia", "Transferencia bancaria", "TRANSF.", "Efectivo", "efec", "Cheque", "Contado", "Tarjeta de crédito"]
+fuentes = ["Recurso propio", "Recursos estatales", "Federal", "Participaciones federales", "Ingresos propios"]
+meses = ["enero", "febrero", "marzo", "abril", "mayo", "junio", "julio", "agosto", "septiembre", "octubre",
+         "noviembre", "diciembre"]
+rfc_letras = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# catálogos mínimos para una base de datos de prueba (SQLite o Postgres local)
+catalogs = {
+    "tipo_procedimiento": pd.DataFrame({"tipo": ["ADJUDICACION DIRECTA", "LICITACION PUBLICA",
+                                                 "INVITACION A CUANDO MENOS TRES PERSONAS", "OTRO"]}),
+    "paises": pd.DataFrame({"nombre": ["MEXICO", "ESTADOS UNIDOS", "ESPAÑA", "CANADA"]}),
+    "entidad_federativa": pd.DataFrame({"clave": [9, 11, 14, 22],
+                                        "nombre": ["Ciudad de México", "Guanajuato", "Jalisco", "Querétaro"]}),
+    "municipio_qro": pd.DataFrame({"clave": [6, 8, 11, 14, 16, 17],
+                                   "nombre": ["Corregidora", "Huimilpan", "El Marqués", "Querétaro",
+                                              "San Juan del Río", "Tequisquiapan"]}),
+}
+
+
+def with_nulls(rng: np.random.Generator, values: np.ndarray, null_rate: float = 0.05,
+               no_aplica_rate: float = 0.05) -> np.ndarray:
+    """Mete None y variantes de "No aplica" en una fracción de las filas."""
+    values = values.astype(object)
+    draw = rng.random(len(values))
+    values[draw < null_rate] = None
+    mask = (draw >= null_rate) & (draw < null_rate + no_aplica_rate)
+    values[mask] = rng.choice(no_aplica, mask.sum())
+    return values
+
+
+def gen_dates(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Fechas en formatos mezclados: dd/mm/aaaa, aaaa-mm-dd, dd-mm-aa, texto en español y seriales de Excel."""
+    days = pd.DatetimeIndex(pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 3 * 365, n), unit="D"))
+    formato = rng.choice(5, n, p=[0.45, 0.35, 0.08, 0.07, 0.05])
+    out = np.empty(n, dtype=object)
+    for f, fmt in enumerate(["%d/%m/%Y", "%Y-%m-%d", "%d-%m-%y"]):
+        mask = formato == f
+        out[mask] = days[mask].strftime(fmt)
+    mask = formato == 3
+    out[mask] = [f"{day.day} de {meses[day.month - 1]} de {day.year}" for day in days[mask]]
+    mask = formato == 4
+    out[mask] = (days[mask] - pd.Timestamp("1899-12-30")).days.astype(str)
+    return with_nulls(rng, out, 0.03, 0.02)
+
+
+def rfc_digito_verificador(rfc: np.ndarray) -> np.ndarray:
+    """Dígito verificador del SAT para RFC sin él (11 caracteres de morales, 12 de físicas)."""
+    valores = {c: i for i, c in enumerate("0123456789ABCDEFGHIJKLMN&OPQRSTUVWXYZ Ñ")}
+    codigos = np.array([valores[c] for c in "".join(np.char.rjust(rfc, 12))]).reshape(-1, 12)
+    residuo = (codigos @ np.arange(13, 1, -1)) % 11
+    return np.array(list("0123456789A"))[np.where(residuo == 0, 0, 11 - residuo)]
+
+
+def gen_rfc(rng: np.random.Generator, n: int) -> np.ndarray:
+    """RFC de personas morales y físicas con espacios, minúsculas, varios RFC juntos o basura."""
+    letras = np.array(rfc_letras)
+    alfanum = np.array(rfc_letras + list("0123456789"))
+    pre = letras[rng.integers(0, len(letras), (n, 4))]
+    prefijo = np.char.add(np.char.add(pre[:, 0], pre[:, 1]), pre[:, 2])
+    prefijo = np.where(rng.random(n) < 0.5, np.char.add(prefijo, pre[:, 3]), prefijo)
+    fecha = np.char.add(np.char.add(np.char.zfill(rng.integers(50, 100, n).astype(str), 2),
+                                    np.char.zfill(rng.integers(1, 13, n).astype(str), 2)),
+                        np.char.zfill(rng.integers(1, 29, n).astype(str), 2))
+    homo = alfanum[rng.integers(0, len(alfanum), (n, 3))]
+    rfc = np.char.add(np.char.add(np.char.add(prefijo, fecha), homo[:, 0]), homo[:, 1])
+    # 9 de cada 10 con dígito verificador correcto, el resto al azar
+    rfc = np.char.add(rfc, np.where(rng.random(n) < 0.9, rfc_digito_verificador(rfc), homo[:, 2])).astype(object)
+
+    out = rfc.copy()
+    kind = rng.random(n)
+    mask = (kind >= 0.6) & (kind < 0.7)
+    out[mask] = [f"{r[:4]} {r[4:10]} {r[10:]}".lower() for r in rfc[mask]]
+    mask = (kind >= 0.7) & (kind < 0.78)
+    out[mask] = [f"{r} / {r}" for r in rfc[mask]]
+    out[(kind >= 0.78) & (kind < 0.84)] = "XAXX010101000"
+    mask = (kind >= 0.84) & (kind < 0.9)
+    out[mask] = [f"XXXX{f}XXX" for f in fecha[mask]]
+    mask = kind >= 0.9
+    out[mask] = [r[:7] for r in rfc[mask]]
+    return with_nulls(rng, out)
+
+
+def gen_nombres(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Nombres con acentos, a veces con prefijo de profesión o con una razón social metida."""
+    out = rng.choice(nombres, n).astype(object)
+    con_prefijo = rng.random(n) < 0.15
+    out[con_prefijo] = [f"{p} {v}" for p, v in zip(rng.choice(profesiones, con_prefijo.sum()), out[con_prefijo])]
+    empresa = rng.random(n) < 0.05
+    out[empresa] = gen_razon_social(rng, empresa.sum(), nulls=False)
+    return with_nulls(rng, out, 0.1, 0.1)
+
+
+def gen_razon_social(rng: np.random.Generator, n: int, nulls: bool = True) -> np.ndarray:
+    out = np.array([f"{g} {m} {s}" for g, m, s in
+                    zip(rng.choice(giros, n), rng.choice(marcas, n), rng.choice(sufijos, n))], dtype=object)
+    return with_nulls(rng, out, 0.1, 0.1) if nulls else out
+
+
+def gen_numero(rng: np.random.Generator, n: int) -> np.ndarray:
+    numeros = rng.integers(1, 3000, n).astype(str).astype(object)
+    letra = rng.random(n) < 0.2
+    numeros[letra] = [f"{v}-{c}" for v, c in zip(numeros[letra], rng.choice(list("ABC"), letra.sum()))]
+    sn = rng.random(n) < 0.1
+    numeros[sn] = rng.choice(["S/N", "SN", "s/n", "KM 5.5", "NA"], sn.sum())
+    return with_nulls(rng, numeros)
+
+
+def gen_montos(rng: np.random.Generator, n: int) -> np.ndarray:
+    montos = np.round(rng.lognormal(10, 1.5, n), 2).astype(str).astype(object)
+    raros = rng.random(n) < 0.05
+    montos[raros] = rng.choice(["0", "$1,500.00", "N/A", "1 500"], raros.sum())
+    return with_nulls(rng, montos, 0.03, 0.0)
+
+
+def choice_column(pool: List[str], null_rate: float = 0.05, no_aplica_rate: float = 0.05):
+    def gen(rng: np.random.Generator, n: int) -> np.ndarray:
+        return with_nulls(rng, rng.choice(pool, n), null_rate, no_aplica_rate)
+    return gen
+
+
+def gen_ejercicio(rng: np.random.Generator, n: int) -> np.ndarray:
+    return with_nulls(rng, rng.choice(["2021", "2022", "2023", "2020", "2O22", "2022.0"], n,
+                                      p=[0.3, 0.35, 0.3, 0.02, 0.01, 0.02]), 0.01, 0.0)
+
+
+def gen_codigo_postal(rng: np.random.Generator, n: int) -> np.ndarray:
+    cps = rng.integers(76000, 76999, n).astype(str).astype(object)
+    raros = rng.random(n) < 0.08
+    cps[raros] = rng.choice(["76.000", "7600", "C.P. 76000", "0"], raros.sum())
+    return with_nulls(rng, cps)
+
+
+def gen_numero_contrato(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Columna de alta cardinalidad: casi un valor distinto por fila."""
+    out = np.array([f"CONT-{anio}-{i:07d}" for anio, i in zip(rng.choice([2021, 2022, 2023], n), range(n))], dtype=object)
+    return with_nulls(rng, out)
+
+
+def gen_texto_libre(rng: np.random.Generator, n: int) -> np.ndarray:
+    return with_nulls(rng, np.array([f"{a} {m}" for a, m in zip(rng.choice(areas, n), rng.choice(marcas, n))], dtype=object))
+
+
+def column_generator(col: str):
+    """Elige el generador según el nombre de la columna (funciona para F1, F2 y FG)."""
+    if col.startswith("fecha"):
+        return gen_dates
+    if col == "ejercicio":
+        return gen_ejercicio
+    if col.startswith("rfc"):
+        return gen_rfc
+    if col.startswith("monto"):
+        return gen_montos
+    if "apellido" in col:
+        return choice_column(apellidos, 0.1, 0.1)
+    if col.startswith("nombre"):
+        return gen_nombres
+    if "razon_social" in col:
+        return gen_razon_social
+    if col == "tipo_procedimiento":
+        return choice_column(tipos_procedimiento, 0.01, 0.0)
+    if col.endswith("tipo_vialidad"):
+        return choice_column(tipos_vialidad)
+    if col.endswith("nombre_vialidad") or col == "domicilio_extranjero_calle":
+        return choice_column(vialidades)
+    if "numero" in col and col != "numero_contrato":
+        return gen_numero
+    if col.endswith("tipo_asentamiento"):
+        return choice_column(tipos_asentamiento)
+    if col.endswith("nombre_asentamiento"):
+        return choice_column(asentamientos)
+    if col.endswith("localidad") or col == "domicilio_extranjero_ciudad":
+        return choice_column(localidades)
+    if "municipio" in col:
+        return choice_column(municipios)
+    if "entidad_federativa" in col:
+        return choice_column(entidades)
+    if col.endswith("pais"):
+        return choice_column(paises)
+    if col.endswith("codigo_postal"):
+        return gen_codigo_postal
+    if col.startswith("area"):
+        return choice_column(areas, 0.02, 0.03)
+    if col in ("tipo_moneda", "tipo_cambio_referencia"):
+        return choice_column(monedas)
+    if col == "forma_pago":
+        return choice_column(formas_pago)
+    if col == "numero_contrato":
+        return gen_numero_contrato
+    if col in ("origen_recursos_publicos", "fuente_financiamiento", "tipo_fondo_participacion_aportacion"):
+        return choice_column(fuentes)
+    return gen_texto_libre
+
+
+def generate_procedimientos(columns: List[str], rows: int, seed: Optional[int] = 0,
+                            start_id: int = 1) -> pd.DataFrame:
+    """
+    Genera rows filas sintéticas con las columnas indicadas (más id e id_procedimiento).
+    Pensado para escalas de 10 mil a 5 millones de filas; con la misma semilla el resultado es idéntico.
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        "id": np.arange(start_id, start_id + rows),
+        "id_procedimiento": np.arange(start_id, start_id + rows) * 7 + 19000000,
+    }
+    for col in columns:
+        if col in data:
+            continue
+        data[col] = pd.Series(column_generator(col)(rng, rows), dtype=object)
+    return pd.DataFrame(data)
+
+
+def create_test_database(engine, table: str, columns: List[str], rows: int, seed: Optional[int] = 0,
+                         chunk_size: int = 100000) -> None:
+    """Crea (o reemplaza) table y los catálogos en engine, generando las filas por bloques."""
+    for name, catalog in catalogs.items():
+        catalog.to_sql(name, engine, index=False, if_exists="replace")
+
+    for block, start in enumerate(range(0, rows, chunk_size)):
+        size = min(chunk_size, rows - start)
+        block_seed = None if seed is None else seed + block
+        chunk = generate_procedimientos(columns, size, block_seed, start_id=start + 1)
+        chunk.to_sql(table, engine, index=False, if_exists="replace" if block == 0 else "append")
+
+    with engine.begin() as connection:
+        preparer = engine.dialect.identifier_preparer
+        connection.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS {preparer.quote('ix_' + table + '_id_procedimiento')} "
+            f"ON {preparer.quote(table)} (id_procedimiento)"
+        )
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+from incremental_state import date_column, date_sort_key
+from streaming_reader import key_column, object_text_columns, read_table_chunks
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError: # pyarrow solo se necesita con snapshot_path
+    pa = pq = None
+
+#-------Snapshot local de las tablas procedimientos_*-------
+# Cada corrida volvía a traer la tabla completa desde el servidor (192.168.100.40 o localhost).
+# Con un snapshot la tabla se exporta una vez a archivos Parquet en disco local, un archivo por bloque
+# de chunk_size filas ordenadas por id_procedimiento (part-00000.parquet, part-00001.parquet...),
+# y _snapshot.json guarda el número de filas, el id_procedimiento máximo y la fecha_actualizacion
+# más alta (como fecha, ver incremental_state.date_sort_key) de la tabla al exportarla.
+# Las siguientes corridas leen los archivos con memory_map y solo vuelven a exportar cuando alguno
+# de los tres cambió: una nueva carga de la PNT o una fila editada con una fecha_actualizacion nueva.
+# Un UPDATE que no cambia el conteo, el id máximo ni la fecha_actualizacion más alta (por ejemplo,
+# una corrección que no actualiza la fecha) no se detecta: en ese caso hay que llamar a
+# export_snapshot (o borrar el directorio) para refrescarlo. Por eso el snapshot es opcional
+# (snapshot_path en cleaning_engine, desactivado por defecto) y solo se acepta con write_mode "queries":
+# con "bulk" esos valores viejos se escribirían directo sobre la tabla.
+
+snapshot_dir = "snapshots"
+metadata_file = "_snapshot.json"
+
+
+def snapshot_path_for(table: str, path: str = snapshot_dir) -> str:
+    return os.path.join(path, table)
+
+
+def source_state(engine, table: str, key: str = key_column) -> dict:
+    """
+    Número de filas, id máximo y fecha_actualizacion más alta (aaaammdd) de la tabla en la base de datos.
+    max_fecha es None si la tabla no tiene fecha_actualizacion.
+    """
+    preparer = engine.dialect.identifier_preparer
+    has_date = date_column in {column["name"] for column in inspect(engine).get_columns(table)}
+    max_date = f"MAX({date_sort_key(preparer.quote(date_column))})" if has_date else "NULL"
+    with engine.connect() as connection:
+        rows, max_id, max_fecha = connection.execute(
+            text(f"SELECT COUNT(*), MAX({preparer.quote(key)}), {max_date} FROM {preparer.quote(table)}")
+        ).one()
+    return {
+        "rows": int(rows),
+        "max_id": None if max_id is None else int(max_id),
+        "max_fecha": None if max_fecha is None else int(max_fecha),
+    }
+
+
+def load_metadata(table: str, path: str = snapshot_dir) -> Optional[dict]:
+    """Metadatos del snapshot de table, o None si no existe."""
+    metadata_path = os.path.join(snapshot_path_for(table, path), metadata_file)
+    if not os.path.exists(metadata_path):
+        return None
+    with open(metadata_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def export_snapshot(engine, table: str, path: str = snapshot_dir, chunk_size: int = 50000,
+                    key: str = key_column) -> dict:
+    """
+    Exporta table a Parquet en un directorio temporal y lo reemplaza al terminar, así una
+    exportación interrumpida nunca deja un snapshot a medias.
+    """
+    if pq is None:
+        raise ImportError("El snapshot local de las tablas necesita pyarrow (pip install pyarrow)")
+
+    state = source_state(engine, table, key)
+    target = snapshot_path_for(table, path)
+    staging = f"{target}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    parts = []
+    for number, chunk in enumerate(read_table_chunks(engine, table, chunk_size, key)):
+        filename = f"part-{number:05d}.parquet"
+        pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False), os.path.join(staging, filename))
+        parts.append({
+            "file": filename,
+            "rows": len(chunk),
+            "min_id": int(chunk[key].min()),
+            "max_id": int(chunk[key].max()),
+        })
+
+    metadata = dict(state, table=table, key=key, chunk_size=chunk_size, parts=parts,
+                    created=datetime.now().isoformat(timespec="seconds"))
+    with open(os.path.join(staging, metadata_file), "w", encoding="utf-8") as file:
+        json.dump(metadata, file, indent=2)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    return metadata
+
+
+def ensure_snapshot(engine, table: str, path: str = snapshot_dir, chunk_size: int = 50000,
+                    key: str = key_column) -> Tuple[dict, bool]:
+    """
+    Regresa (metadatos, exportado): reutiliza el snapshot si el conteo, el id máximo y la
+    fecha_actualizacion más alta de la tabla no cambiaron desde la exportación; si cambiaron
+    (o no existe, o es de una versión sin max_fecha) lo vuelve a exportar.
+    """
+    metadata = load_metadata(table, path)
+    if metadata is not None and metadata.get("key") == key and "max_fecha" in metadata:
+        state = source_state(engine, table, key)
+        if all(state[name] == metadata[name] for name in ("rows", "max_id", "max_fecha")):
+            return metadata, False
+    return export_snapshot(engine, table, path, chunk_size, key), True
+
+
+def read_snapshot_chunks(table: str, path: str = snapshot_dir, id_range: Optional[Tuple[int, int]] = None,
+                         key: str = key_column) -> Iterator[pd.DataFrame]:
+    """
+    Igual que read_table_chunks pero desde el snapshot: un DataFrame por archivo, en orden de key.
+    Con id_range solo se abren los archivos que se traslapan con el rango y se filtran sus filas.
+    """
+    if pq is None:
+        raise ImportError("El snapshot local de las tablas necesita pyarrow (pip install pyarrow)")
+    metadata = load_metadata(table, path)
+    if metadata is None:
+        raise FileNotFoundError(f"No existe el snapshot de {table} en {path}; ejecute ensure_snapshot primero")
+
+    directory = snapshot_path_for(table, path)
+    for part in metadata["parts"]:
+        if id_range is not None and (part["max_id"] < id_range[0] or part["min_id"] > id_range[1]):
+            continue
+        chunk = object_text_columns(pq.read_table(os.path.join(directory, part["file"]), memory_map=True).to_pandas())
+        if id_range is not None:
+            chunk = chunk[chunk[key].between(id_range[0], id_range[1])].reset_index(drop=True)
+        yield chunk
@@ -0,0 +1,48 @@
+import json
+import os
+import sys
+
+import pytest
+
+# los scripts de limpieza se importan y ejecutan desde scripts/cleaning_scripts (rutas relativas)
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+import benchmark_cleaning
+
+
+@pytest.fixture
+def in_cleaning_scripts(monkeypatch):
+    monkeypatch.chdir(cleaning_scripts_dir)
+
+
+def test_benchmark_runs_end_to_end(tmp_path, in_cleaning_scripts):
+    tracked_log = os.path.join(cleaning_scripts_dir, "cleaning_errors.log")
+    log_before = os.stat(tracked_log).st_mtime_ns if os.path.exists(tracked_log) else None
+    output = tmp_path / "benchmark_results.json"
+
+    status = benchmark_cleaning.main([
+        "--rows", "300", "--sample", "100", "--chunk-size", "120", "--output", str(output),
+    ])
+
+    assert status == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["results"]["pipeline"]["rows"] == 300
+    assert report["results"]["clean_cln_4"]["calls"] == 100
+    assert not os.path.exists(f"{output}.tmp")
+    # el log de la corrida va al directorio temporal, no al de la carpeta
+    after = os.stat(tracked_log).st_mtime_ns if os.path.exists(tracked_log) else None
+    assert after == log_before
+
+
+def test_benchmark_failure_leaves_no_results(tmp_path, in_cleaning_scripts, monkeypatch):
+    output = tmp_path / "benchmark_results.json"
+
+    def broken_pipeline(*args, **kwargs):
+        raise RuntimeError("limpieza rota")
+
+    monkeypatch.setattr(benchmark_cleaning, "run_pipeline", broken_pipeline)
+    with pytest.raises(RuntimeError, match="limpieza rota"):
+        benchmark_cleaning.main(["--rows", "100", "--sample", "50", "--output", str(output),
+                                 "--log-path", str(tmp_path / "cleaning.log")])
+    assert not output.exists()
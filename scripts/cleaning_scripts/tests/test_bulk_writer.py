@@ -0,0 +1,207 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+from psycopg2 import sql
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+import cleaning_engine
+from bulk_writer import bulk_update, changed_cells, copy_chunk, copy_field, update_from_staging
+
+test_database_url = os.environ.get("PNT_TEST_DATABASE_URL") # Postgres desechable para las pruebas contra la base
+
+
+class FakeCursor:
+    """Guarda el SQL (ya como texto) y lo que se envía por COPY, sin conexión a Postgres."""
+
+    def __init__(self, has_index=True, rowcount=0):
+        self.statements = []
+        self.copied = []
+        self.has_index = has_index
+        self.rowcount = rowcount
+
+    def execute(self, query, params=None):
+        self.statements.append(render(query))
+
+    def fetchone(self):
+        return (1,) if self.has_index else None
+
+    def copy_expert(self, query, buffer):
+        self.statements.append(render(query))
+        self.copied.append(buffer.read())
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.fake_cursor = cursor
+        self.events = []
+
+    def cursor(self):
+        return self.fake_cursor
+
+    def commit(self):
+        self.events.append("commit")
+
+    def rollback(self):
+        self.events.append("rollback")
+
+    def close(self):
+        self.events.append("close")
+
+
+class FakeEngine:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def raw_connection(self):
+        return self.connection
+
+
+def render(query) -> str:
+    """Texto de un sql.Composed sin pasar por libpq (los identificadores entre comillas dobles)."""
+    if isinstance(query, str):
+        return " ".join(query.split())
+    if isinstance(query, sql.Composed):
+        return "".join(render(part) for part in query.seq)
+    if isinstance(query, sql.Identifier):
+        return ".".join(f'"{part}"' for part in query.strings)
+    return query.string
+
+
+def test_changed_cells_treats_every_null_alike():
+    raw = pd.DataFrame({
+        "a": [None, float("nan"), "NULL", None, pd.NA, "x"],
+        "b": ["2022", 2022, "AV", "AV", None, "x"],
+    })
+    cleaned = pd.DataFrame({
+        "a": ["NULL", "NULL", "NULL", None, "NULL", "NULL"],
+        "b": [2022, "2022", "AVENIDA", "AV", "CALLE", "x"],
+    })
+
+    changed = changed_cells(raw, cleaned)
+
+    assert changed["a"].tolist() == [False, False, False, False, False, True]
+    assert changed["b"].tolist() == [False, False, True, False, True, False]
+
+
+def test_changed_only_queries_leave_out_null_columns(monkeypatch, capsys):
+    raw = pd.DataFrame({
+        "id_procedimiento": [1, 2, 3],
+        "domicilio_fiscal_tipo_vialidad": [None, "NULL", None],
+        "domicilio_fiscal_nombre_vialidad": ["av. juárez", "AV JUAREZ", "Calle 5"],
+    })
+    cleaned = pd.DataFrame({
+        "domicilio_fiscal_tipo_vialidad": ["NULL", "NULL", "NULL"],
+        "domicilio_fiscal_nombre_vialidad": ["AV JUAREZ", "AV JUAREZ", "CALLE 5"],
+    })
+    monkeypatch.setattr(cleaning_engine, "table", "procedimientos_adj")
+    monkeypatch.setattr(cleaning_engine, "write_mode", "queries")
+    monkeypatch.setattr(cleaning_engine, "write_changed_only", True)
+    monkeypatch.setattr(cleaning_engine, "query_block", [])
+
+    changed = cleaning_engine.diff_cleaned(raw, cleaned)
+    cleaning_engine.write_cleaned(cleaned, raw["id_procedimiento"].tolist(), changed)
+
+    # la columna que era nula y sigue nula no se escribe, y la fila 2 no cambió: no lleva UPDATE
+    assert cleaning_engine.query_block == [
+        "UPDATE procedimientos_adj SET domicilio_fiscal_nombre_vialidad = 'AV JUAREZ' WHERE id_procedimiento = 1;",
+        "UPDATE procedimientos_adj SET domicilio_fiscal_nombre_vialidad = 'CALLE 5' WHERE id_procedimiento = 3;",
+    ]
+    assert "filas sin cambios que no se escriben: 1" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("a\tb", "a\\tb"),
+    ("a\nb", "a\\nb"),
+    ("a\r\nb", "a\\r\\nb"),
+    ("C:\\temp", "C:\\\\temp"),
+    ("\\N", "\\\\N"), # el texto \N no es un nulo
+    ("\\\t", "\\\\\\t"),
+    ("NULL", "\\N"),
+    ("null", "null"),
+    (None, "\\N"),
+    (float("nan"), "\\N"),
+    (pd.NA, "\\N"),
+    (pd.NaT, "\\N"),
+    (2022, "2022"),
+    ("", ""),
+])
+def test_copy_field_escapes(value, expected):
+    assert copy_field(value) == expected
+
+
+def test_copy_chunk_sends_escaped_rows():
+    cursor = FakeCursor()
+
+    copy_chunk(cursor, [(1, "a\tb", None), (2, "NULL", "x\\y\nz")], ["col_a", "col_b"])
+
+    assert cursor.statements == [
+        'COPY "pg_temp"."staging_limpieza" ("id_procedimiento", "col_a", "col_b") FROM STDIN'
+    ]
+    assert cursor.copied == ["1\ta\\tb\t\\N\n2\t\\N\tx\\\\y\\nz\n"]
+
+
+def test_update_from_staging_joins_on_key():
+    cursor = FakeCursor(rowcount=7)
+
+    updated = update_from_staging(cursor, "procedimientos_adj", ["col_a", "col_b"])
+
+    assert updated == 7
+    assert cursor.statements == [
+        'UPDATE "procedimientos_adj" AS t SET "col_a" = s."col_a", "col_b" = s."col_b" '
+        'FROM "pg_temp"."staging_limpieza" AS s WHERE t."id_procedimiento" = s."id_procedimiento"'
+    ]
+
+
+def test_bulk_update_copies_and_commits_each_chunk():
+    cursor = FakeCursor(rowcount=2)
+    connection = FakeConnection(cursor)
+    cleaned = pd.DataFrame({"col_a": ["A", "NULL", "C"]})
+
+    updated = bulk_update(FakeEngine(connection), "procedimientos_adj", cleaned, [10, 11, 12], chunk_size=2)
+
+    assert updated == 4
+    assert cursor.copied == ["10\tA\n11\t\\N\n", "12\tC\n"]
+    assert [statement.split()[0] for statement in cursor.statements] == [
+        "SELECT", "DROP", "CREATE",
+        "TRUNCATE", "COPY", "UPDATE",
+        "TRUNCATE", "COPY", "UPDATE",
+        "DROP",
+    ]
+    assert connection.events == ["commit"] * 4 + ["close"]
+
+
+def test_bulk_update_needs_key_index():
+    connection = FakeConnection(FakeCursor(has_index=False))
+
+    with pytest.raises(RuntimeError, match="no tiene un índice"):
+        bulk_update(FakeEngine(connection), "procedimientos_adj", pd.DataFrame({"col_a": ["A"]}), [1])
+    assert connection.events == ["rollback", "close"]
+
+
+@pytest.mark.skipif(test_database_url is None, reason="PNT_TEST_DATABASE_URL no está definida")
+def test_bulk_update_round_trips_special_characters():
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(test_database_url)
+    values = ["tab\there", "línea\nnueva", "C:\\ruta\\N", "\\N", "NULL", None]
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS prueba_bulk_writer"))
+        conn.execute(text("CREATE TABLE prueba_bulk_writer (id_procedimiento int PRIMARY KEY, valor text)"))
+        conn.execute(text("INSERT INTO prueba_bulk_writer SELECT g, 'x' FROM generate_series(1, :n) g"),
+                     {"n": len(values)})
+    try:
+        ids = list(range(1, len(values) + 1))
+        updated = bulk_update(engine, "prueba_bulk_writer", pd.DataFrame({"valor": values}), ids, chunk_size=4)
+        with engine.connect() as conn:
+            stored = conn.execute(text("SELECT valor FROM prueba_bulk_writer ORDER BY id_procedimiento")).scalars().all()
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS prueba_bulk_writer"))
+        engine.dispose()
+
+    assert updated == len(values)
+    assert stored == values[:4] + [None, None]
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pandas as pd
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+from cleaning_engine import DateColumnParser
+
+compact_values = [
+    "050312", "150312", "220611", "311299", "991231", "123456", "010100", "2023110",
+    "20231101", "20230511", "19991231", "31122023", "12345678", "20231345",
+]
+
+
+def baseline(value):
+    date = pd.to_datetime(value, dayfirst=True, errors="coerce")
+    return "NULL" if pd.isna(date) else date.strftime("%Y-%m-%d")
+
+
+def test_compact_dates_match_baseline():
+    expected = [baseline(value) for value in compact_values]
+
+    column = DateColumnParser().parse_column(pd.Series(compact_values, dtype=object), "fecha")
+
+    assert column.tolist() == expected
+    assert expected[:3] == ["2012-03-05", "2012-03-15", "2011-06-22"]
+
+
+def test_scalar_compact_dates_match_baseline():
+    cold = DateColumnParser()
+    warm = DateColumnParser()
+    # la familia compacta queda como la más frecuente de la columna
+    warm.parse_column(pd.Series(["20231101", "20230511", "19991231"], dtype=object), "fecha")
+
+    for value in compact_values:
+        assert cold.parse_value(value, "fecha") == baseline(value), value
+        assert warm.parse_value(value, "fecha") == baseline(value), value
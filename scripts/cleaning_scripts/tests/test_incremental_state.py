@@ -0,0 +1,135 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+import incremental_state
+from incremental_state import (create_state_tables, date_sort_key, load_watermark, pending_filter,
+                               read_pending_chunks, record_row_hashes, state_table, update_watermark,
+                               watermark_table)
+
+test_database_url = os.environ.get("PNT_TEST_DATABASE_URL") # Postgres desechable para las pruebas contra la base
+needs_database = pytest.mark.skipif(test_database_url is None, reason="PNT_TEST_DATABASE_URL no está definida")
+hash_condition = "(s.hash_fila IS NULL OR s.hash_fila <> md5(CAST(t AS text)))"
+
+
+def test_full_check_compares_every_hash(monkeypatch):
+    monkeypatch.setattr(incremental_state, "load_watermark", lambda engine, table: pytest.fail("no se usa"))
+
+    condition, params = pending_filter(create_engine("postgresql+psycopg2://"), "procedimientos_adj", True)
+
+    assert condition == hash_condition
+    assert params == {"tabla": "procedimientos_adj"}
+
+
+def test_watermark_limits_the_rows_checked(monkeypatch):
+    engine = create_engine("postgresql+psycopg2://")
+    monkeypatch.setattr(incremental_state, "load_watermark", lambda engine, table: (10, "2023-06-15"))
+
+    condition, params = pending_filter(engine, "procedimientos_adj", False)
+
+    row_date = date_sort_key("t.fecha_actualizacion")
+    assert condition == (f"(t.id_procedimiento > :max_id OR {row_date} > {date_sort_key(':max_fecha')} "
+                         f"OR {row_date} IS NULL) AND {hash_condition}")
+    assert params == {"tabla": "procedimientos_adj", "max_id": 10, "max_fecha": "2023-06-15"}
+
+    monkeypatch.setattr(incremental_state, "load_watermark", lambda engine, table: (10, None))
+    assert pending_filter(engine, "procedimientos_adj", False)[0] == f"t.id_procedimiento > :max_id AND {hash_condition}"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(test_database_url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def table(engine):
+    table = "prueba_incremental"
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        connection.execute(text(f"CREATE TABLE {table} (id_procedimiento bigint PRIMARY KEY, "
+                                f"fecha_actualizacion text, valor text)"))
+        connection.execute(text(f"INSERT INTO {table} VALUES "
+                                f"(1, '2023-05-01', 'a'), (2, '15/06/2023', 'b'), (3, '01/02/2023', 'c')"))
+    create_state_tables(engine)
+    yield table
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        connection.execute(text(f"DELETE FROM {state_table} WHERE tabla = :tabla"), {"tabla": table})
+        connection.execute(text(f"DELETE FROM {watermark_table} WHERE tabla = :tabla"), {"tabla": table})
+
+
+def pending_ids(engine, table, full_check):
+    return [int(id_proc) for chunk in read_pending_chunks(engine, table, 2, full_check=full_check)
+            for id_proc in chunk["id_procedimiento"]]
+
+
+def clean_all(engine, table, full_check=True):
+    ids = pending_ids(engine, table, full_check)
+    record_row_hashes(engine, table, ids)
+    update_watermark(engine, table, len(ids))
+    return ids
+
+
+@needs_database
+def test_date_sort_key_reads_mixed_formats(engine):
+    values = {
+        "2023-11-05": 20231105, "2023/1/5": 20230105, " 2023-11-05 10:30:00": 20231105,
+        "05/11/2023": 20231105, "5-1-2023": 20230105, "05.11.2023 10:30": 20231105,
+        "31/02/2023": 20230231, # sin validar el día, pero sin error
+        "nov 2023": None, "": None, None: None,
+    }
+    with engine.connect() as connection:
+        for value, expected in values.items():
+            assert connection.execute(text(f"SELECT {date_sort_key(':v')}"), {"v": value}).scalar() == expected, value
+
+
+@needs_database
+def test_watermark_is_the_latest_date_not_the_latest_text(engine, table):
+    assert clean_all(engine, table) == [1, 2, 3]
+
+    # como texto '2023-05-01' es la mayor; como fecha es 15/06/2023
+    assert load_watermark(engine, table) == (3, "2023-06-15")
+    assert pending_ids(engine, table, True) == []
+    assert pending_ids(engine, table, False) == []
+
+
+@needs_database
+def test_pending_rows_against_the_watermark(engine, table):
+    clean_all(engine, table)
+    with engine.begin() as connection:
+        connection.execute(text(f"""
+            UPDATE {table} SET valor = valor || '*', fecha_actualizacion = CASE id_procedimiento
+                WHEN 1 THEN '2023-06-15' -- igual al watermark, en el otro formato
+                WHEN 2 THEN '01/07/2023' -- después del watermark, aunque como texto es menor
+                WHEN 3 THEN 'sin fecha' END
+        """))
+        connection.execute(text(f"INSERT INTO {table} VALUES (4, '2023-01-01', 'd')"))
+
+    # sin full_check la fila 1 no se revisa: su fecha no pasa del watermark
+    assert pending_ids(engine, table, False) == [2, 3, 4]
+    # con full_check el hash de la fila 1 también cambió
+    assert pending_ids(engine, table, True) == [1, 2, 3, 4]
+
+    assert clean_all(engine, table) == [1, 2, 3, 4]
+    assert load_watermark(engine, table) == (4, "2023-07-01")
+    assert pending_ids(engine, table, True) == []
+
+
+@needs_database
+def test_full_check_ignores_rows_that_did_not_change(engine, table):
+    clean_all(engine, table)
+    with engine.begin() as connection:
+        # mismos valores: el hash no cambia
+        connection.execute(text(f"UPDATE {table} SET valor = valor WHERE id_procedimiento = 1"))
+        connection.execute(text(f"UPDATE {table} SET valor = 'B' WHERE id_procedimiento = 2"))
+
+    assert pending_ids(engine, table, True) == [2]
+    # sin full_check una edición que no mueve la fecha no se detecta
+    assert pending_ids(engine, table, False) == []
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import pytest
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+from cleaning_engine import KeywordAutomaton, clean_cln_40
+
+
+def test_automaton_finds_overlapping_keywords():
+    automaton = KeywordAutomaton({"HE": 1, "SHE": 2, "HERS": 3, "HIS": 4})
+
+    assert automaton.find("USHERS") == [("SHE", 2), ("HE", 1), ("HERS", 3)]
+    assert automaton.find("AHISHE") == [("HIS", 4), ("SHE", 2), ("HE", 1)]
+    assert automaton.find("XYZ") == []
+
+
+def test_automaton_follows_fail_links():
+    automaton = KeywordAutomaton({"TRANSF": "T", "EFEC": "E"})
+
+    assert automaton.find("TRANEFECTRANSF") == [("EFEC", "E"), ("TRANSF", "T")]
+    assert automaton.find("EFEFEC") == [("EFEC", "E")]
+
+
+@pytest.mark.parametrize("value, expected", [
+    # igual que antes: solo fuzzy en TRANSFERENCIA y EFECTIVO, en ese orden
+    ("Transferencia", "TRANSFERENCIA BANCARIA"),
+    ("Transf. electrónica", "TRANSFERENCIA BANCARIA"),
+    ("Contado", "EFECTIVO"),
+    ("Efectivo y tranferencia", "TRANSFERENCIA BANCARIA"),
+    ("Transferencia y cheque", "TRANSFERENCIA BANCARIA"),
+    ("Decreto", "NULL"),
+    ("Acreditación", "NULL"),
+    ("EDITORA OFFSET COLOR SA DE CV", "NULL"),
+    ("N/A", "NULL"),
+    (None, "NULL"),
+    # categorías nuevas, solo con palabra completa
+    ("Cheque nominativo", "CHEQUE"),
+    ("Cheques", "CHEQUE"),
+    ("Tarjeta de crédito", "TARJETA"),
+    ("A crédito", "CREDITO"),
+    ("Chequera", "NULL"),
+])
+def test_forma_pago(value, expected):
+    assert clean_cln_40(value) == expected
@@ -0,0 +1,89 @@
+import itertools
+import os
+import sys
+import threading
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+from pipeline_runner import PipelineError, run_pipeline
+
+
+def run_with_timeout(chunks, clean, write, timeout=10):
+    """Corre el pipeline en otro hilo: si se bloquea, la prueba falla en lugar de quedarse esperando."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = run_pipeline(chunks, clean, write, depth=1, progress=None)
+        except BaseException as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "el pipeline se quedó bloqueado"
+    assert [t for t in threading.enumerate() if t.name in ("lectura", "escritura")] == []
+    return outcome
+
+
+def endless_chunks():
+    # sin fin: si una etapa falla, el lector tiene que detenerse por su cuenta
+    return itertools.repeat([0] * 10)
+
+
+def fail_at(calls: list, position: int, error: BaseException):
+    def stage(item):
+        calls.append(item)
+        if len(calls) == position:
+            raise error
+        return item
+    return stage
+
+
+def test_pipeline_writes_every_chunk():
+    written = []
+
+    outcome = run_with_timeout(([i] * 10 for i in range(20)), lambda chunk: chunk[0], written.append)
+
+    rows, stages = outcome["result"]
+    assert rows == 200
+    assert written == list(range(20))
+    assert stages["escritura"]["chunks"] == 20
+
+
+def test_clean_error_reaches_the_caller():
+    calls = []
+
+    outcome = run_with_timeout(endless_chunks(), fail_at(calls, 3, ValueError("limpieza")), lambda result: None)
+
+    # el error de la limpieza se propaga tal cual
+    assert isinstance(outcome["error"], ValueError)
+    assert len(calls) == 3
+
+
+def test_reader_error_reaches_the_caller():
+    def chunks():
+        yield from [[0] * 10] * 3
+        raise ConnectionError("lectura")
+
+    outcome = run_with_timeout(chunks(), lambda chunk: chunk, lambda result: None)
+
+    assert isinstance(outcome["error"], PipelineError)
+    assert isinstance(outcome["error"].__cause__, ConnectionError)
+
+
+def test_writer_error_reaches_the_caller():
+    calls = []
+
+    outcome = run_with_timeout(endless_chunks(), lambda chunk: chunk, fail_at(calls, 2, OSError("escritura")))
+
+    assert isinstance(outcome["error"], PipelineError)
+    assert isinstance(outcome["error"].__cause__, OSError)
+    assert len(calls) == 2 # después del error ya no se escribe nada
+
+
+def test_writer_interrupt_is_not_wrapped():
+    outcome = run_with_timeout(endless_chunks(), lambda chunk: chunk, fail_at([], 1, KeyboardInterrupt()))
+
+    assert isinstance(outcome["error"], KeyboardInterrupt)
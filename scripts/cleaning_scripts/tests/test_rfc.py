@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+from cleaning_engine import clean_cln_11, extract_rfcs, rfc_check_digits_valid
+
+# RFC reales: persona física (13 caracteres) y personas morales (12 caracteres)
+fisica = "GODE561231GR8"
+morales = ["PME380607P35", "CFE370814QI0", "SAT970701NN3"]
+
+
+def test_check_digit_of_fisica_and_moral():
+    assert rfc_check_digits_valid([fisica] + morales).tolist() == [True, True, True, True]
+
+
+def test_wrong_check_digit_is_rejected():
+    rfcs = ["GODE561231GR9", "PME380607P34", "CFE370814QI1", fisica]
+
+    assert rfc_check_digits_valid(rfcs).tolist() == [False, False, False, True]
+    assert extract_rfcs(rfcs) == ["NULL", "NULL", "NULL", fisica]
+
+
+def test_mixed_lengths_in_one_block():
+    # las morales se recorren una posición; mezcladas con físicas no deben afectarse entre sí
+    rfcs = [morales[0], fisica, "PME380607P34", morales[1], "GODE561231GR9", morales[2]]
+
+    assert rfc_check_digits_valid(rfcs).tolist() == [True, True, False, True, False, True]
+
+
+@pytest.mark.parametrize("rfc, neighbours", [
+    ("ÑAÑO800101AA5", ["NANO800101AA5", "OAOO800101AA5"]), # física con Ñ
+    ("ÑAB010101AB5", ["NAB010101AB5", "OAB010101AB5"]), # moral con Ñ
+    ("M&RO800101XY0", ["MNRO800101XY0", "MORO800101XY0"]), # física con &
+    ("&AB010101AB8", ["NAB010101AB8", "OAB010101AB8"]), # moral con &
+])
+def test_enie_and_ampersand_values(rfc, neighbours):
+    # & vale 24 (entre N y O) y Ñ vale 38: con N u O en su lugar el dígito ya no corresponde
+    assert rfc_check_digits_valid([rfc] + neighbours).tolist() == [True, False, False]
+    assert extract_rfcs([rfc.lower()]) == [rfc]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("PME380607P35", "PME380607P35"), # 12 caracteres
+    ("GODE561231GR8", "GODE561231GR8"), # 13 caracteres
+    ("PME380607P3", "NULL"), # 11 caracteres
+    ("pme 380607 p35", "PME380607P35"),
+    ("XAXX010101000", "XAXX010101000"), # genérico, sin dígito verificador válido
+    ("GODE561231GR8 / PME380607P35, GODE561231GR8", "GODE561231GR8, PME380607P35"),
+])
+def test_clean_cln_11(value, expected):
+    assert clean_cln_11(value) == expected
@@ -0,0 +1,41 @@
+import os
+import sys
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+import cleaning_engine
+
+
+def test_run_uses_settings_changed_after_import(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_clean_table(chunk_size, workers):
+        calls.append((chunk_size, workers))
+        return 0, cleaning_engine.memo_report()
+
+    monkeypatch.setattr(cleaning_engine, "table", "procedimientos_adj")
+    monkeypatch.setattr(cleaning_engine, "log_path", str(tmp_path / "cleaning_errors.log"))
+    monkeypatch.setattr(cleaning_engine, "profile_path", None)
+    monkeypatch.setattr(cleaning_engine, "clean_table", fake_clean_table)
+    monkeypatch.setattr(cleaning_engine, "chunk_size", 1234)
+    monkeypatch.setattr(cleaning_engine, "parallel_workers", 3)
+
+    cleaning_engine.run_cleaning_process()
+    cleaning_engine.run_cleaning_process(chunk_size=10, workers=1)
+
+    assert calls == [(1234, 3), (10, 1)]
+
+
+def test_read_chunks_uses_module_chunk_size(monkeypatch):
+    calls = []
+    monkeypatch.setattr(cleaning_engine, "incremental_mode", False)
+    monkeypatch.setattr(cleaning_engine, "snapshot_path", None)
+    monkeypatch.setattr(cleaning_engine, "chunk_size", 777)
+    monkeypatch.setattr(cleaning_engine, "read_table_chunks",
+                        lambda engine, table, chunk_size, id_range=None: calls.append((chunk_size, id_range)))
+
+    cleaning_engine.read_chunks(id_range=(1, 5))
+    cleaning_engine.read_chunks(50)
+
+    assert calls == [(777, (1, 5)), (50, None)]
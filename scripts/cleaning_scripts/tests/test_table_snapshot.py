@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+cleaning_scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, cleaning_scripts_dir)
+
+import cleaning_engine
+
+
+def test_snapshot_needs_queries_write_mode(monkeypatch):
+    monkeypatch.setattr(cleaning_engine, "table", "procedimientos_adj")
+    monkeypatch.setattr(cleaning_engine, "incremental_mode", False)
+    monkeypatch.setattr(cleaning_engine, "snapshot_path", "snapshots")
+    monkeypatch.setattr(cleaning_engine, "write_mode", "bulk")
+
+    # antes de conectarse o exportar nada
+    with pytest.raises(ValueError, match="write_mode = 'queries'"):
+        cleaning_engine.clean_table(100, 1)
@@ -0,0 +1,78 @@
+from typing import Iterable, List
+
+import xlsxwriter
+
+#-------Reporte de Excel en modo streaming-------
+# El reporte de variaciones se escribe con xlsxwriter en modo constant_memory: cada fila se escribe
+# y se libera al pasar a la siguiente, así la memoria no crece con los valores distintos de una columna.
+# El ancho de cada columna se calcula mientras se escriben las filas (sin astype(str) sobre la tabla
+# de frecuencias) y las gráficas solo guardan la referencia al rango de la hoja.
+
+default_width = 10
+max_width = 100 # Excel no permite columnas de más de 255 caracteres; más de 100 ya no se lee
+
+
+class StreamingReport:
+    """
+    Libro de Excel escrito hoja por hoja y fila por fila:
+        with StreamingReport("analisis.xlsx") as report:
+            rows = report.write_sheet("Hoja", ["Valor", "Frecuencia"], filas)
+            report.add_bar_chart("Hoja", rows, name="...", title="...")
+    En constant_memory las filas de cada hoja se escriben en orden y ya no se pueden modificar.
+    """
+
+    def __init__(self, path: str):
+        self.workbook = xlsxwriter.Workbook(path, {
+            "constant_memory": True,
+            "strings_to_formulas": False, # los valores de la PNT son texto aunque empiecen con "="
+            "strings_to_urls": False,
+            "default_date_format": "yyyy-mm-dd",
+        })
+        self.sheets = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        self.workbook.close()
+
+    def write_sheet(self, name: str, headers: List[str], rows: Iterable) -> int:
+        """
+        Escribe headers y las filas de rows en una hoja nueva; regresa el número de filas de datos.
+        El ancho de cada columna es el texto más largo de la columna (o del encabezado) + 2.
+        """
+        worksheet = self.workbook.add_worksheet(name)
+        self.sheets[name] = worksheet
+        widths = [len(str(header)) for header in headers]
+        worksheet.write_row(0, 0, headers)
+
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            worksheet.write_row(count, 0, row)
+            for idx, value in enumerate(row):
+                length = len(str(value))
+                if length > widths[idx]:
+                    widths[idx] = length
+
+        for idx, width in enumerate(widths):
+            worksheet.set_column(idx, idx, min(width + 2, max_width) if width else default_width)
+        return count
+
+    def add_bar_chart(self, sheet: str, rows: int, name: str, title: str,
+                      x_axis: str = "Valor", y_axis: str = "Frecuencia", anchor: str = "D2") -> None:
+        """Gráfica de barras de las columnas A (categorías) y B (valores) de sheet, filas 2 a rows + 1."""
+        chart = self.workbook.add_chart({"type": "bar"})
+        chart.add_series({
+            "categories": [sheet, 1, 0, rows, 0],
+            "values": [sheet, 1, 1, rows, 1],
+            "name": name,
+            "fill": {"color": "#1f77b4"},
+            "line": {"color": "#1f77b4"},
+        })
+        chart.set_title({"name": title})
+        chart.set_x_axis({"name": x_axis})
+        chart.set_y_axis({"name": y_axis})
+        self.sheets[sheet].insert_chart(anchor, chart)
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from functools import partial
+from typing import Dict, List
+
+import pandas as pd
+from sqlalchemy import Date, DateTime, Float, Integer, Numeric, inspect, text
+
+#-------Tablas de frecuencia calculadas en Postgres-------
+# En lugar de cargar la tabla completa en pandas para hacer value_counts() por columna, cada consulta
+# agrupa varias columnas en un solo recorrido de la tabla con GROUPING SETS y solo regresa
+# (valor, frecuencia) de cada valor distinto. La memoria del análisis ya no depende del número de filas.
+
+columns_per_scan = 8 # columnas agrupadas en cada recorrido de la tabla
+
+
+def table_columns(engine, table: str) -> Dict[str, str]:
+    """
+    Columnas de table (en orden) con el tipo que tendrían en pandas: 'Integer', 'Float',
+    'Datetime' o 'String'. Se leen del catálogo de la base de datos, sin traer filas.
+    """
+    types = {}
+    for column in inspect(engine).get_columns(table):
+        sql_type = column["type"]
+        if isinstance(sql_type, Integer):
+            types[column["name"]] = "Integer"
+        elif isinstance(sql_type, (Float, Numeric)):
+            types[column["name"]] = "Float"
+        elif isinstance(sql_type, (Date, DateTime)):
+            types[column["name"]] = "Datetime"
+        else:
+            types[column["name"]] = "String"
+    return types
+
+
+def grouping_sets_query(engine, table: str, columns: List[str]) -> str:
+    """
+    SELECT c1, c2, ..., frecuencia, g0, g1, ... GROUP BY GROUPING SETS ((c1), (c2), ...).
+    gi = GROUPING(ci) vale 0 solo en las filas del conjunto de ci.
+    """
+    preparer = engine.dialect.identifier_preparer
+    quoted = [preparer.quote(col) for col in columns]
+    select = ", ".join(
+        quoted + ["COUNT(*) AS frecuencia"] + [f"GROUPING({col}) AS g{idx}" for idx, col in enumerate(quoted)]
+    )
+    sets = ", ".join(f"({col})" for col in quoted)
+    return (
+        f"SELECT {select} FROM {preparer.quote(table)} "
+        f"GROUP BY GROUPING SETS ({sets}) ORDER BY frecuencia DESC"
+    )
+
+
+def batch_value_counts(engine, table: str, batch: List[str]) -> Dict[str, pd.Series]:
+    """Tablas de frecuencia de las columnas de batch en un solo recorrido de la tabla."""
+    values = {col: [] for col in batch}
+    counts = {col: [] for col in batch}
+    with engine.connect() as connection:
+        for row in connection.execute(text(grouping_sets_query(engine, table, batch))):
+            flags = row[len(batch) + 1:]
+            idx = flags.index(0)
+            value = row[idx]
+            if value is None: # value_counts() descarta los nulos
+                continue
+            values[batch[idx]].append(float(value) if isinstance(value, Decimal) else value)
+            counts[batch[idx]].append(row[len(batch)])
+
+    return {
+        col: pd.Series(counts[col], index=pd.Index(values[col], name=col), name="count", dtype="int64")
+        for col in batch
+    }
+
+
+def value_counts_sql(engine, table: str, columns: List[str], batch_size: int = columns_per_scan,
+                     threads: int = 1) -> Dict[str, pd.Series]:
+    """
+    Equivalente a {col: df[col].value_counts() for col in columns} sin cargar la tabla:
+    los NULL no se cuentan y cada serie queda ordenada de mayor a menor frecuencia.
+    Con threads > 1 los grupos de columnas se consultan al mismo tiempo, cada hilo con su propia
+    conexión del pool del engine (el trabajo lo hace Postgres; los hilos solo esperan la respuesta).
+    """
+    batches = [columns[start:start + batch_size] for start in range(0, len(columns), batch_size)]
+    analyses = {}
+    if threads > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for result in pool.map(partial(batch_value_counts, engine, table), batches):
+                analyses.update(result)
+    else:
+        for batch in batches:
+            analyses.update(batch_value_counts(engine, table, batch))
+    return {col: analyses[col] for col in columns}
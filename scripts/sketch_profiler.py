@@ -0,0 +1,150 @@
+import math
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+#-------Perfilado aproximado con sketches-------
+# Para tablas muy grandes o columnas de texto libre (razon_social_contratista, area_responsable_informacion...)
+# la tabla de frecuencias exacta ocupa memoria proporcional a los valores distintos. En este modo la tabla
+# se recorre una sola vez por bloques y cada columna se resume en dos estructuras de tamaño fijo:
+# - HyperLogLog (2^precision registros de un byte): valores distintos con error estándar de 1.04 / sqrt(2^precision).
+# - Space-Saving (capacity contadores): los valores más frecuentes; cada frecuencia estimada es mayor o
+#   igual a la real y a lo más "error" por encima de ella.
+# Los conteos de filas y de nulos son exactos.
+
+sketch_precision = 14 # HyperLogLog: 16384 registros, error estándar ~0.8%
+sketch_capacity = 1000 # Space-Saving: valores más frecuentes que se conservan por columna
+sketch_chunk_size = 100000 # filas por bloque leído de la base de datos
+
+
+class HyperLogLog:
+    """Estimador de valores distintos a partir del hash de 64 bits de cada valor."""
+
+    def __init__(self, precision: int = sketch_precision):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, hashes: np.ndarray) -> None:
+        if not len(hashes):
+            return
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        # posición del primer 1 en los bits restantes (tail_bits + 1 si todos son 0)
+        bit_length = np.zeros(len(tail), dtype=np.int64)
+        nonzero = tail > 0
+        bit_length[nonzero] = np.floor(np.log2(tail[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # rango bajo: conteo lineal de registros vacíos
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+
+class SpaceSaving:
+    """
+    Valores más frecuentes de un flujo, en la variante que se puede combinar por bloques: cada bloque
+    llega ya contado (value_counts) y se suma al resumen; se conservan los capacity mayores.
+    Un valor ausente de un resumen lleno se cuenta con el mínimo de ese resumen (floor), así la
+    frecuencia estimada nunca queda por debajo de la real y errors acota la diferencia.
+    """
+
+    def __init__(self, capacity: int = sketch_capacity):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype="int64")
+        self.errors = pd.Series(dtype="int64")
+        self.floor = 0 # frecuencia máxima posible de un valor que no está en el resumen
+
+    def update(self, chunk_counts: pd.Series) -> None:
+        chunk_floor = 0
+        if len(chunk_counts) > self.capacity:
+            chunk_counts = chunk_counts.sort_values(ascending=False, kind="stable")
+            chunk_floor = int(chunk_counts.iloc[self.capacity])
+            chunk_counts = chunk_counts.iloc[:self.capacity]
+
+        index = self.counts.index.append(chunk_counts.index).unique()
+        counts = self.counts.reindex(index, fill_value=self.floor) + chunk_counts.reindex(index, fill_value=chunk_floor)
+        errors = (self.errors.reindex(index, fill_value=self.floor)
+                  + pd.Series(0, index=chunk_counts.index, dtype="int64").reindex(index, fill_value=chunk_floor))
+
+        if len(counts) > self.capacity:
+            counts = counts.sort_values(ascending=False, kind="stable")
+            self.floor = int(counts.iloc[self.capacity - 1])
+            counts = counts.iloc[:self.capacity]
+        else:
+            self.floor += chunk_floor
+        self.counts = counts
+        self.errors = errors[counts.index]
+
+    def top(self) -> pd.DataFrame:
+        """Frecuencia estimada y error máximo de cada valor, de mayor a menor frecuencia."""
+        order = self.counts.sort_values(ascending=False, kind="stable").index
+        return pd.DataFrame({"Frecuencia": self.counts[order], "Error": self.errors[order]})
+
+
+class ColumnSketch:
+    """Resumen de tamaño fijo de una columna: filas, nulos, distintos (HLL) y más frecuentes (Space-Saving)."""
+
+    def __init__(self, precision: int = sketch_precision, capacity: int = sketch_capacity):
+        self.rows = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog(precision)
+        self.frequent = SpaceSaving(capacity)
+
+    @property
+    def total(self) -> int:
+        """Valores no nulos (la 'Frecuencia Total' del reporte exacto)."""
+        return self.rows - self.nulls
+
+    def update(self, series: pd.Series) -> None:
+        # un solo factorize por bloque: los nulos quedan en -1 y solo se hashean los valores distintos
+        # (al HyperLogLog le da igual ver un valor una o varias veces)
+        codes, uniques = pd.factorize(series)
+        valid = codes[codes >= 0]
+        self.rows += len(codes)
+        self.nulls += len(codes) - len(valid)
+        if not len(valid):
+            return
+        uniques = pd.Series(uniques, dtype=object)
+        self.distinct.update(pd.util.hash_pandas_object(uniques, index=False).to_numpy())
+        self.frequent.update(pd.Series(np.bincount(valid, minlength=len(uniques)), index=uniques.to_numpy()))
+
+    def unique_estimate(self) -> int:
+        # nunca menos valores distintos de los que el Space-Saving tiene separados con certeza
+        return max(int(round(self.distinct.estimate())), int((self.frequent.counts > self.frequent.floor).sum()))
+
+    def description(self) -> str:
+        return (f"Aproximado: valores únicos con HyperLogLog (±{self.distinct.relative_error:.1%}), "
+                f"frecuencias con Space-Saving (top {self.frequent.capacity}, error máximo en la hoja de la columna)")
+
+
+def read_column_chunks(engine, table: str, columns: List[str], chunk_size: int = sketch_chunk_size) -> Iterator[pd.DataFrame]:
+    """Recorre solo las columnas indicadas de table con un cursor del lado del servidor."""
+    preparer = engine.dialect.identifier_preparer
+    query = f"SELECT {', '.join(preparer.quote(col) for col in columns)} FROM {preparer.quote(table)}"
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunk_size) as connection:
+        for chunk in pd.read_sql(text(query), connection, chunksize=chunk_size):
+            yield chunk
+
+
+def sketch_table(engine, table: str, columns: List[str], chunk_size: int = sketch_chunk_size,
+                 precision: int = sketch_precision, capacity: int = sketch_capacity) -> Dict[str, ColumnSketch]:
+    """Un recorrido de la tabla; la memoria queda acotada por chunk_size, precision y capacity."""
+    sketches = {col: ColumnSketch(precision, capacity) for col in columns}
+    for chunk in read_column_chunks(engine, table, columns, chunk_size):
+        for col in columns:
+            sketches[col].update(chunk[col])
+    return sketches
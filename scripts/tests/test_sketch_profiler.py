@@ -0,0 +1,57 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+scripts_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, scripts_dir)
+
+from sketch_profiler import ColumnSketch, HyperLogLog, SpaceSaving
+
+
+def distinct_values(n: int, seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series([f"PROVEEDOR {value}" for value in rng.permutation(n * 10)[:n]], dtype=object)
+
+
+@pytest.mark.parametrize("precision", [10, 14])
+@pytest.mark.parametrize("n", [500, 20000, 200000])
+def test_hyperloglog_within_relative_error(precision, n):
+    sketch = HyperLogLog(precision)
+    values = distinct_values(n, seed=n)
+    # por bloques y con repetidos: el estimado solo depende de los valores distintos
+    for chunk in (values[:n // 2], values[n // 4:], values[:n // 3]):
+        sketch.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+
+    # relative_error es el error estándar: con semilla fija se pide a lo más 3 veces
+    assert abs(sketch.estimate() - n) / n <= 3 * sketch.relative_error
+
+
+def test_space_saving_keeps_true_heavy_hitters():
+    rng = np.random.default_rng(7)
+    stream = pd.Series(rng.zipf(1.3, 200000).astype(str), dtype=object)
+    sketch = SpaceSaving(capacity=50)
+    for start in range(0, len(stream), 10000):
+        sketch.update(stream[start:start + 10000].value_counts())
+
+    exact = stream.value_counts()
+    top = sketch.top()
+    for value in exact.index[:10]:
+        assert value in top.index
+        # la frecuencia estimada nunca queda debajo de la real y Error acota la diferencia
+        assert exact[value] <= top.loc[value, "Frecuencia"] <= exact[value] + top.loc[value, "Error"]
+    assert list(top.index[:5]) == list(exact.index[:5])
+    assert len(top) == 50
+
+
+def test_column_sketch_counts_rows_and_nulls_exactly():
+    series = pd.Series(["A", None, "B", "A", None, "C", "A"], dtype=object)
+    sketch = ColumnSketch(precision=10, capacity=2)
+    sketch.update(series[:4])
+    sketch.update(series[4:])
+
+    assert (sketch.rows, sketch.nulls, sketch.total) == (7, 2, 5)
+    assert sketch.unique_estimate() == 3
+    assert sketch.frequent.top().index[0] == "A"